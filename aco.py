@@ -1,13 +1,20 @@
+import time
+
 import numpy as np
 
+from feromonio import AntSystem
+from historico import History
+
 
 class ACO_VRP:
     def __init__(self, routes, vehicle_capacity, num_ants, num_iterations, alpha=1.0, beta=2.0, rho=0.5, Q=10,
-                 max_stagnation=5):
+                 max_stagnation=5, time_limit=None, verbose=True, on_iteration=None,
+                 pheromone_update=None, profiler=None, history_mode='full', history_size=1000):
         self.routes = routes
         self.vehicle_capacity = vehicle_capacity
         self.demand = routes.get_demand()
         self.distance_matrix = routes.get_distance_matrix()
+        self.distance_array = np.asarray(self.distance_matrix, dtype=float)
         self.num_ants = num_ants
         self.num_iterations = num_iterations
         self.alpha = alpha
@@ -15,31 +22,63 @@ class ACO_VRP:
         self.rho = rho
         self.Q = Q
         self.num_customers = len(self.demand)
-        self.pheromone = np.ones((self.num_customers, self.num_customers))
+        # Estratégia de atualização do feromônio (ver feromonio.py); padrão: Ant System
+        self.pheromone_update = pheromone_update if pheromone_update is not None else AntSystem()
+        self.pheromone = self.pheromone_update.reset(self)
         self.best_solution = None
         self.best_cost = float('inf')
         self.max_stagnation = max_stagnation
-        self.history = {"cost": [], "solution": []}
+        # Histórico de custos/soluções: 'full', 'ring' (últimos history_size), 'log' ou 'off' (ver historico.py)
+        self.history = History(history_mode, history_size)
+        self.time_limit = time_limit  # Orçamento de tempo (s) por execução; None = sem limite
+        self.verbose = verbose
+        self.on_iteration = on_iteration  # Chamado como on_iteration(aco, num_vehicles, iteration) a cada iteração
+        self.start_time = None
+        self.stop_requested = False
+        # Instrumentação opcional (ver perfil.py); None = desligada, sem custo no caminho crítico
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.attach(self)
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def notify(self, num_vehicles, iteration):
+        if self.on_iteration is not None:
+            self.on_iteration(self, num_vehicles, iteration)
+
+    def stop(self):
+        # Pode ser chamado de outra thread; a execução termina ao fim da iteração corrente
+        self.stop_requested = True
+
+    def should_stop(self):
+        if self.stop_requested:
+            return True
+        return self.time_limit is not None and time.perf_counter() - self.start_time >= self.time_limit
 
     def run(self):
         num_vehicles = int(np.ceil(sum(self.demand)/self.vehicle_capacity))
         stagnation = True
+        self.start_time = time.perf_counter()
 
         while stagnation:
-            print(f'{"-="*15} Trying with {num_vehicles} vehicles {"=-"*15}')
+            self.log(f'{"-="*15} Trying with {num_vehicles} vehicles {"=-"*15}')
             try:
                 for iteration in range(self.num_iterations):
                     solutions = self.construct_solutions(num_vehicles)
                     self.update_pheromone(solutions)
                     self.update_best_solution(solutions)
-                    self.history["cost"].append((num_vehicles, iteration, self.best_cost))
-                    print(f'Iteration {iteration + 1}: Best cost = {self.best_cost}')
+                    self.history.add_cost(num_vehicles, iteration, self.best_cost)
+                    self.log(f'Iteration {iteration + 1}: Best cost = {self.best_cost}')
+                    self.notify(num_vehicles, iteration)
+                    if self.should_stop():
+                        break
                 stagnation = False
             except ValueError:
-                stagnation = True
-                pass
+                stagnation = not self.should_stop()
             num_vehicles += 1
-            self.pheromone = np.ones((self.num_customers, self.num_customers))
+            self.pheromone = self.pheromone_update.reset(self)
         return self.best_solution, self.best_cost
 
     def construct_solutions(self, num_vehicles):
@@ -51,6 +90,7 @@ class ACO_VRP:
 
     def construct_solution(self, num_vehicles):
         stagnation_counter = 0
+        placed = 0  # Clientes inseridos na tentativa corrente (para o profiler)
         remaining_customers = set(range(1, self.num_customers))
         vehicle_loads = [0] * num_vehicles
         vehicle_routes = [[0] for _ in range(num_vehicles)]
@@ -70,12 +110,17 @@ class ACO_VRP:
                         vehicle_routes[vehicle].append(next_customer)
                         vehicle_loads[vehicle] += self.demand[next_customer]
                         remaining_customers.remove(next_customer)
+                        placed += 1
                         progress_made = True
                     else:
                         vehicle_routes[vehicle].append(0)
 
                 if not progress_made:
                     stagnation_counter += 1
+                    if self.profiler is not None:
+                        self.profiler.count('restarts')
+                        self.profiler.count('discarded_steps', placed)
+                    placed = 0
 
                     if stagnation_counter >= self.max_stagnation:
                         raise ValueError("Não é possível construir uma solução com o número atual de veículos.")
@@ -88,6 +133,9 @@ class ACO_VRP:
             if route[-1] != 0:
                 route.append(0)
 
+        if self.profiler is not None:
+            self.profiler.count('constructions')
+            self.profiler.count('steps', placed)
         return vehicle_routes
 
     def select_next_customer(self, current_location, remaining_customers, current_load):
@@ -97,6 +145,8 @@ class ACO_VRP:
                 prob = ((self.pheromone[current_location][customer] ** self.alpha) *
                         ((1.0 / self.distance_matrix[current_location][customer]) ** self.beta))
                 probabilities.append((customer, prob))
+        if self.profiler is not None:
+            self.profiler.count('rejected_capacity', len(remaining_customers) - len(probabilities))
 
         if not probabilities:
             return None
@@ -112,12 +162,7 @@ class ACO_VRP:
         return None
 
     def update_pheromone(self, solutions):
-        self.pheromone *= (1 - self.rho)
-        for solution in solutions:
-            cost = self.calculate_cost(solution)
-            for route in solution:
-                for i in range(len(route) - 1):
-                    self.pheromone[route[i]][route[i + 1]] += self.Q / cost
+        self.pheromone_update.update(self, solutions)
 
     def update_best_solution(self, solutions):
         for solution in solutions:
@@ -125,7 +170,7 @@ class ACO_VRP:
             if cost < self.best_cost:
                 self.best_cost = cost
                 self.best_solution = solution
-                self.history["solution"].append(self.best_solution)
+                self.history.add_solution(self.best_solution)
 
     def calculate_cost(self, solution):
         total_cost = 0
@@ -136,20 +181,150 @@ class ACO_VRP:
             total_cost += route_cost
         return total_cost
 
+    # ATUALIZAÇÃO INCREMENTAL DA INSTÂNCIA (clientes adicionados, removidos ou alterados durante o dia)
+    def add_customer(self, coordinate, demand, times=None):
+        # times: tempos de viagem do novo cliente até as cidades existentes (apenas Route_Time; sem eles,
+        # Route_Time.add_customer os sorteia)
+        if times is None:
+            index = self.routes.add_customer(coordinate, demand)
+        else:
+            index = self.routes.add_customer(coordinate, demand, times)
+        distances = np.asarray(self.distance_matrix[index], dtype=float)
+        self.distance_array = self.grow_matrix(self.distance_array, distances)
+        # O novo cliente recebe o feromônio médio; as trilhas aprendidas são mantidas
+        self.pheromone = self.grow_matrix(self.pheromone, np.full(index + 1, self.pheromone.mean()))
+        self.instance_changed()
+        return index
+
+    def remove_customer(self, index):
+        self.routes.remove_customer(index)
+        self.distance_array = np.delete(np.delete(self.distance_array, index, axis=0), index, axis=1)
+        self.pheromone = np.delete(np.delete(self.pheromone, index, axis=0), index, axis=1)
+        self.instance_changed()
+        # Soluções guardadas (melhor e histórico) são renumeradas para os novos índices
+        if self.best_solution is not None:
+            self.best_solution = self.renumber_best(index)
+        self.history.map_solutions(lambda solution: self.renumber_solution(solution, index))
+
+    @staticmethod
+    def renumber_routes(routes, index):
+        return [[location - (location > index) for location in route if location != index] for route in routes]
+
+    def renumber_solution(self, solution, index):
+        # Formato de uma solução do histórico: lista de rotas
+        return self.renumber_routes(solution, index)
+
+    def renumber_best(self, index):
+        return self.renumber_solution(self.best_solution, index)
+
+    def update_customer(self, index, demand=None, coordinate=None):
+        self.routes.update_customer(index, demand, coordinate)
+        if coordinate is not None:
+            distances = np.asarray(self.distance_matrix[index], dtype=float)
+            self.distance_array[index, :] = distances
+            self.distance_array[:, index] = distances
+        self.instance_changed()
+
+    @staticmethod
+    def grow_matrix(matrix, row):
+        size = len(row)
+        grown = np.empty((size, size))
+        grown[:-1, :-1] = matrix
+        grown[-1, :] = row
+        grown[:, -1] = row
+        return grown
+
+    def instance_changed(self):
+        self.num_customers = len(self.demand)
+        if hasattr(self, 'time_matrix'):
+            self.time_matrix = self.routes.get_time_matrix()
+        self.pheromone_update.forget_best()
+        self.best_cost = float('inf')
+
+    def repair_solution(self, solution):
+        # Remove do fim das rotas os clientes que estouram a capacidade e reinsere os ausentes
+        # na posição de menor custo (vetorizado sobre as posições); sem posição viável, abre uma nova rota
+        routes = [[location for location in route if location != 0] for route in solution or []]
+        routed = {location for route in routes for location in route}
+        unrouted = [customer for customer in range(1, self.num_customers) if customer not in routed]
+        loads = []
+        for route in routes:
+            load = sum(self.demand[customer] for customer in route)
+            while load > self.vehicle_capacity:
+                customer = route.pop()
+                load -= self.demand[customer]
+                unrouted.append(customer)
+            loads.append(load)
+
+        for customer in sorted(unrouted, key=lambda c: self.demand[c], reverse=True):
+            best = None
+            for route_index, route in enumerate(routes):
+                if loads[route_index] + self.demand[customer] > self.vehicle_capacity:
+                    continue
+                path = np.array([0] + route + [0])
+                delta = (self.distance_array[path[:-1], customer] + self.distance_array[customer, path[1:]] -
+                         self.distance_array[path[:-1], path[1:]])
+                position = int(np.argmin(delta))
+                if best is None or delta[position] < best[0]:
+                    best = (delta[position], route_index, position)
+            if best is None:
+                routes.append([customer])
+                loads.append(self.demand[customer])
+            else:
+                _, route_index, position = best
+                routes[route_index].insert(position, customer)
+                loads[route_index] += self.demand[customer]
+
+        return [[0] + route + [0] for route in routes if route]
+
+    def reoptimize(self, num_iterations=20, time_limit=None):
+        # Modo dinâmico: repara a melhor solução atual e continua a busca por um orçamento curto,
+        # aproveitando o feromônio já aprendido
+        num_vehicles = self.repair_best()
+        previous_time_limit = self.time_limit
+        self.time_limit = time_limit
+        self.start_time = time.perf_counter()
+        try:
+            for iteration in range(num_iterations):
+                solutions = self.construct_solutions(num_vehicles)
+                self.update_pheromone(solutions)
+                self.update_best_solution(solutions)
+                self.history.add_cost(num_vehicles, iteration, self.best_cost)
+                self.log(f'Reoptimization {iteration + 1}: Best cost = {self.best_cost}')
+                self.notify(num_vehicles, iteration)
+                if self.should_stop():
+                    break
+        except ValueError:
+            pass  # A construção do zero não coube na frota da solução reparada; mantém o reparo
+        finally:
+            self.time_limit = previous_time_limit
+        return self.best_solution, self.best_cost
+
+    def repair_best(self):
+        # Repara a melhor solução para a instância atual e devolve o tamanho da frota usada na reotimização
+        self.best_solution = self.repair_solution(self.best_solution)
+        self.best_cost = self.calculate_cost(self.best_solution)
+        self.history.add_solution(self.best_solution)
+        return len(self.best_solution)
+
 
 class MO_ACO_VRP(ACO_VRP):
     def __init__(self, routes, vehicle_capacity, num_ants, num_iterations, alpha=1.0, beta=2.0, rho=0.5, Q=10,
-                 max_stagnation=5, veichle_reset=5):
-        super().__init__(routes, vehicle_capacity, num_ants, num_iterations, alpha, beta, rho, Q, max_stagnation)
+                 max_stagnation=5, veichle_reset=5, time_limit=None, verbose=True, on_iteration=None,
+                 pheromone_update=None, profiler=None, history_mode='full', history_size=1000):
+        super().__init__(routes, vehicle_capacity, num_ants, num_iterations, alpha, beta, rho, Q, max_stagnation,
+                         time_limit, verbose, on_iteration, pheromone_update, profiler,
+                         history_mode, history_size)
         self.num_vehicles = int(np.ceil(sum(self.demand)/self.vehicle_capacity))
         self.veichle_reset = veichle_reset
 
     def run(self):
         reset = 0
         stagnation_counter = 0
+        self.start_time = time.perf_counter()
 
-        while reset < self.veichle_reset:
-            print(f'{"-="*15} Trying with {self.num_vehicles} vehicles {"=-"*15}')
+        while reset < self.veichle_reset and not self.should_stop():
+            self.log(f'{"-="*15} Trying with {self.num_vehicles} vehicles {"=-"*15}')
             try:
                 for iteration in range(self.num_iterations):
                     solutions = self.construct_solutions(self.num_vehicles)
@@ -160,8 +335,11 @@ class MO_ACO_VRP(ACO_VRP):
                         stagnation_counter += 1
                     else:
                         stagnation_counter = 0
-                    self.history["cost"].append((self.num_vehicles, iteration, self.best_cost))
-                    print(f'Iteration {iteration + 1}: Best cost = {self.best_cost}')
+                    self.history.add_cost(self.num_vehicles, iteration, self.best_cost)
+                    self.log(f'Iteration {iteration + 1}: Best cost = {self.best_cost}')
+                    self.notify(self.num_vehicles, iteration)
+                    if self.should_stop():
+                        break
                     if stagnation_counter > self.max_stagnation:
                         stagnation_counter = 0
                         reset += 1
@@ -169,7 +347,7 @@ class MO_ACO_VRP(ACO_VRP):
             except ValueError:
                 pass
             self.num_vehicles += 1
-            self.pheromone = np.ones((self.num_customers, self.num_customers))
+            self.pheromone = self.pheromone_update.reset(self)
 
     def update_best_solution(self, solutions):
         for solution in solutions:
@@ -177,89 +355,171 @@ class MO_ACO_VRP(ACO_VRP):
             if cost < self.best_cost:
                 self.best_cost = cost
                 self.best_solution = (self.num_vehicles, solution)
-                self.history["solution"].append(self.best_solution)
+                self.history.add_solution(self.best_solution)
+
+    def renumber_solution(self, solution, index):
+        # Aqui as soluções são (num_vehicles, rotas)
+        num_vehicles, routes = solution
+        return num_vehicles, self.renumber_routes(routes, index)
+
+    def repair_best(self):
+        # Aqui best_solution é (num_vehicles, rotas); a frota passa a ser a da solução reparada
+        routes = self.repair_solution(self.best_solution[1] if self.best_solution is not None else None)
+        self.num_vehicles = len(routes)
+        self.best_solution = (self.num_vehicles, routes)
+        self.best_cost = self.calculate_cost(routes)
+        self.history.add_solution(self.best_solution)
+        return self.num_vehicles
 
 
 class MO_ACO_VRPT(ACO_VRP):
     def __init__(self, routes, vehicle_capacity, num_ants, num_iterations, alpha=1.0, beta=2.0, rho=0.5, Q=10,
-                 max_stagnation=5):
-        super().__init__(routes, vehicle_capacity, num_ants, num_iterations, alpha, beta, rho, Q, max_stagnation)
+                 max_stagnation=5, time_limit=None, verbose=True, on_iteration=None,
+                 pheromone_update=None, max_route_time=None, time_windows=None, profiler=None,
+                 history_mode='full', history_size=1000):
+        super().__init__(routes, vehicle_capacity, num_ants, num_iterations, alpha, beta, rho, Q, max_stagnation,
+                         time_limit, verbose, on_iteration, pheromone_update, profiler,
+                         history_mode, history_size)
         self.time_matrix = routes.get_time_matrix()
         self.num_vehicles = int(np.ceil(sum(self.demand)/self.vehicle_capacity))
         self.best_pareto_front = []
+        # Restrições opcionais de tempo: duração máxima de cada rota (ida e volta ao depósito) e
+        # janelas [início, fim] para o atendimento de cada cidade (chegar antes do início implica espera)
+        self.max_route_time = max_route_time
+        self.time_windows = np.asarray(time_windows, dtype=float) if time_windows is not None else None
+        self.weights = None
 
     def run(self):
         all_solutions = []
         stagnation = True
+        self.start_time = time.perf_counter()
+        self._check_time_feasibility()
 
         while stagnation:
-            print(f'{"-="*15} Trying with {self.num_vehicles} vehicles {"=-"*15}')
+            self.log(f'{"-="*15} Trying with {self.num_vehicles} vehicles {"=-"*15}')
             try:
                 for iteration in range(self.num_iterations):
                     solutions = self._construct_solutions()
                     self._update_pheromone(solutions)
                     all_solutions.extend(solutions)
-                    print(f'Iteration {iteration + 1}')
+                    self.log(f'Iteration {iteration + 1}')
+                    self.notify(self.num_vehicles, iteration)
+                    if self.should_stop():
+                        break
                 stagnation = False
             except ValueError:
-                stagnation = True
-                pass
+                stagnation = not self.should_stop()
             self.num_vehicles += 1
-            self.pheromone = np.ones((self.num_customers, self.num_customers))
+            self.pheromone = self.pheromone_update.reset(self)
 
         self.best_pareto_front, self.best_solution = self._get_pareto_front(all_solutions)
 
         return self.best_pareto_front, self.best_solution
 
     def _construct_solutions(self):
+        # Feromônio e heurística (distância e tempo) são fixos durante a iteração: calcula os pesos uma vez
+        time_matrix = np.asarray(self.time_matrix, dtype=float)
+        with np.errstate(divide='ignore'):
+            heuristic = ((1.0 / self.distance_array) ** self.beta) * ((1.0 / time_matrix) ** self.beta)
+        self.weights = (self.pheromone ** self.alpha) * heuristic
+
         solutions = []
         for _ in range(self.num_ants):
             solution = self._construct_solution()
             solutions.append(solution)
         return solutions
 
+    def _arrival_times(self, current_position, current_time):
+        # Início do atendimento em cada cidade partindo de current_position no instante current_time
+        arrival = current_time + np.asarray(self.time_matrix[current_position], dtype=float)
+        if self.time_windows is not None:
+            arrival = np.maximum(arrival, self.time_windows[:, 0])
+        return arrival
+
+    def _feasible_in_time(self, arrival):
+        feasible = np.ones(len(arrival), dtype=bool)
+        if self.time_windows is not None:
+            feasible &= arrival <= self.time_windows[:, 1]
+        if self.max_route_time is not None:
+            # Precisa ainda ser possível voltar ao depósito dentro da duração máxima
+            feasible &= arrival + np.asarray(self.time_matrix)[:, 0] <= self.max_route_time
+        return feasible
+
+    def _check_time_feasibility(self):
+        remaining = np.ones(self.num_customers, dtype=bool)
+        remaining[0] = False
+        unreachable = remaining & ~self._feasible_in_time(self._arrival_times(0, 0.0))
+        if unreachable.any():
+            raise ValueError(f"Cidades inatingíveis com as restrições de tempo: "
+                             f"{np.flatnonzero(unreachable).tolist()}")
+
     def _construct_solution(self):
-        # Similar ao ACO_VRP mas ajustado para multiobjetivo
+        # Similar ao ACO_VRP mas ajustado para multiobjetivo. Cada veículo mantém seu tempo acumulado e só
+        # são candidatos os clientes que cabem na capacidade e respeitam as restrições de tempo
+        demand = np.asarray(self.demand)
         stagnation_counter = 0
-        solution = [[0] for _ in range(self.num_vehicles)]
-        remaining_customers = set(range(1, self.num_customers))
 
-        while stagnation_counter < self.max_stagnation:
+        while True:
+            solution = [[0] for _ in range(self.num_vehicles)]
+            vehicle_times = np.zeros(self.num_vehicles)
+            remaining = np.ones(self.num_customers, dtype=bool)
+            remaining[0] = False
+            remaining_demand = demand[remaining].sum()
+            placed = 0  # Clientes inseridos nesta tentativa (para o profiler)
+
             for vehicle_index in range(self.num_vehicles):
+                # Corte antecipado: a demanda restante não cabe nos veículos que ainda restam
+                if remaining_demand > (self.num_vehicles - vehicle_index) * self.vehicle_capacity:
+                    break
                 current_load = 0
                 current_position = 0
-                while remaining_customers and current_load < self.vehicle_capacity:
-                    next_customer = self._select_next_customer(current_position, remaining_customers)
-                    if current_load + self.demand[next_customer] <= self.vehicle_capacity:
-                        solution[vehicle_index].append(next_customer)
-                        current_load += self.demand[next_customer]
-                        remaining_customers.remove(next_customer)
-                        current_position = next_customer
-                    else:
+                while remaining.any():
+                    arrival = self._arrival_times(current_position, vehicle_times[vehicle_index])
+                    candidates = remaining & (current_load + demand <= self.vehicle_capacity)
+                    if self.profiler is not None:
+                        self.profiler.count('rejected_capacity', int(remaining.sum() - candidates.sum()))
+                        fitting = int(candidates.sum())
+                    candidates &= self._feasible_in_time(arrival)
+                    if self.profiler is not None:
+                        self.profiler.count('rejected_time', fitting - int(candidates.sum()))
+                    next_customer = self._select_next_customer(current_position, candidates)
+                    if next_customer is None:
                         break
+                    solution[vehicle_index].append(next_customer)
+                    current_load += demand[next_customer]
+                    remaining_demand -= demand[next_customer]
+                    remaining[next_customer] = False
+                    placed += 1
+                    vehicle_times[vehicle_index] = arrival[next_customer]
+                    current_position = next_customer
+                vehicle_times[vehicle_index] += self.time_matrix[current_position][0]
                 solution[vehicle_index].append(0)
 
-            if remaining_customers:
-                remaining_customers = set(range(1, self.num_customers))
-                stagnation_counter += 1
-
-                if stagnation_counter >= self.max_stagnation:
-                    raise ValueError("Não é possível construir uma solução com o número atual de veículos.")
-            else:
+            if not remaining.any():
                 break
+            stagnation_counter += 1
+            if self.profiler is not None:
+                self.profiler.count('restarts')
+                self.profiler.count('discarded_steps', placed)
+            if stagnation_counter >= self.max_stagnation:
+                raise ValueError("Não é possível construir uma solução com o número atual de veículos.")
 
+        for route in solution:
+            if route[-1] != 0:
+                route.append(0)
+        if self.profiler is not None:
+            self.profiler.count('constructions')
+            self.profiler.count('steps', placed)
         return solution
 
-    def _select_next_customer(self, current_position, remaining_customers):
-        probabilities = []
-        for customer in remaining_customers:
-            pheromone = self.pheromone[current_position][customer]
-            distance = self.distance_matrix[current_position][customer]
-            time = self.time_matrix[current_position][customer]
-            prob = (pheromone ** self.alpha) * ((1.0 / distance) ** self.beta) * ((1.0 / time) ** self.beta)
-            probabilities.append(prob)
-        probabilities = np.array(probabilities) / np.sum(probabilities)
-        return np.random.choice(list(remaining_customers), p=probabilities)
+    def _select_next_customer(self, current_position, candidates):
+        # Uma única amostragem vetorizada (roleta por soma acumulada) sobre os candidatos viáveis
+        indices = np.flatnonzero(candidates)
+        if len(indices) == 0:
+            return None
+        cumulative = np.cumsum(self.weights[current_position, indices])
+        choice = np.searchsorted(cumulative, np.random.rand() * cumulative[-1], side='right')
+        return int(indices[min(choice, len(indices) - 1)])
 
     def _evaluate_solution(self, solution):
         total_distance = 0
@@ -269,17 +529,93 @@ class MO_ACO_VRPT(ACO_VRP):
             for i in range(len(route) - 1):
                 total_distance += self.distance_matrix[route[i]][route[i + 1]]
                 aux_time += self.time_matrix[route[i]][route[i + 1]]
+                if self.time_windows is not None and route[i + 1] != 0:
+                    aux_time = max(aux_time, self.time_windows[route[i + 1], 0])  # Espera pela janela
             if aux_time >= total_time:
                 total_time = aux_time
         return total_distance, total_time
 
     def _update_pheromone(self, solutions):
-        self.pheromone *= (1 - self.rho)
-        for solution in solutions:
-            total_distance, total_time = self._evaluate_solution(solution)
-            for route in solution:
-                for i in range(len(route) - 1):
-                    self.pheromone[route[i]][route[i + 1]] += self.Q / (total_distance + total_time)
+        self.pheromone_update.update(self, solutions)
+
+    def pheromone_costs(self, solutions):
+        # Custo usado pelas estratégias de feromônio: soma dos dois objetivos
+        return np.array([sum(self._evaluate_solution(solution)) for solution in solutions], dtype=float)
+
+    def add_customer(self, coordinate, demand, times=None, time_window=None):
+        # time_window: janela [início, fim] do novo cliente; sem ela, o cliente pode ser atendido a qualquer hora
+        if self.time_windows is not None or time_window is not None:
+            windows = self.time_windows if self.time_windows is not None else [[0, np.inf]] * self.num_customers
+            new_window = time_window if time_window is not None else [0, np.inf]
+            self.time_windows = np.vstack([windows, [new_window]]).astype(float)
+        return super().add_customer(coordinate, demand, times)
+
+    def remove_customer(self, index):
+        # As janelas são ajustadas antes, pois a renumeração do fronte reavalia as soluções
+        if self.time_windows is not None:
+            self.time_windows = np.delete(self.time_windows, index, axis=0)
+        super().remove_customer(index)
+
+    def update_customer(self, index, demand=None, coordinate=None, time_window=None):
+        if time_window is not None:
+            if self.time_windows is None:
+                self.time_windows = np.array([[0, np.inf]] * self.num_customers)
+            self.time_windows[index] = time_window
+        super().update_customer(index, demand, coordinate)
+
+    def renumber_best(self, index):
+        # Aqui best_solution é a lista de soluções do fronte de Pareto; os objetivos são recalculados
+        self.best_solution = [self.renumber_routes(solution, index) for solution in self.best_solution]
+        self.best_pareto_front = [self._evaluate_solution(solution) for solution in self.best_solution]
+        return self.best_solution
+
+    def instance_changed(self):
+        super().instance_changed()
+        # O fronte descrevia a instância anterior; volta a valer após run() ou reoptimize()
+        # (na remoção, renumber_best o recalcula)
+        self.best_pareto_front = []
+
+    def reoptimize(self, num_iterations=20, time_limit=None):
+        # Modo dinâmico: as soluções do fronte são reparadas (capacidade) e mantidas se ainda respeitam as
+        # restrições de tempo; a busca continua por um orçamento curto com o feromônio já aprendido
+        self._check_time_feasibility()
+        all_solutions = [solution for solution in map(self.repair_solution, self.best_solution or [])
+                         if self._respects_time(solution)]
+        previous_time_limit = self.time_limit
+        self.time_limit = time_limit
+        self.start_time = time.perf_counter()
+        iteration = 0
+        try:
+            while iteration < num_iterations and not self.should_stop():
+                try:
+                    solutions = self._construct_solutions()
+                except ValueError:
+                    # A frota não comporta a instância alterada: tenta com um veículo a mais
+                    self.num_vehicles += 1
+                    continue
+                self._update_pheromone(solutions)
+                all_solutions.extend(solutions)
+                self.log(f'Reoptimization {iteration + 1}')
+                self.notify(self.num_vehicles, iteration)
+                iteration += 1
+        finally:
+            self.time_limit = previous_time_limit
+
+        self.best_pareto_front, self.best_solution = self._get_pareto_front(all_solutions)
+        return self.best_pareto_front, self.best_solution
+
+    def _respects_time(self, solution):
+        for route in solution:
+            elapsed = 0.0
+            for i in range(len(route) - 1):
+                elapsed += self.time_matrix[route[i]][route[i + 1]]
+                if self.time_windows is not None and route[i + 1] != 0:
+                    if elapsed > self.time_windows[route[i + 1], 1]:
+                        return False
+                    elapsed = max(elapsed, self.time_windows[route[i + 1], 0])
+            if self.max_route_time is not None and elapsed > self.max_route_time:
+                return False
+        return True
 
     def _get_pareto_front(self, solutions):
         pareto_front = []
@@ -0,0 +1,235 @@
+import time
+
+import numpy as np
+
+from historico import History
+
+
+class ALNS_VRP:
+    """Busca adaptativa em grandes vizinhanças (ALNS, ruin-and-recreate) para o CVRP.
+
+    Mesma entrada (Route) e saída (best_solution, best_cost) do ACO_VRP. A cada iteração um operador de
+    remoção (aleatória, por proximidade ou de pior custo) destrói parte da solução e um de inserção (gulosa ou
+    regret-k, respeitando a capacidade) a reconstrói; o resultado é aceito por simulated annealing. Os pesos
+    dos operadores se adaptam ao sucesso em cada segmento de iterações.
+    """
+
+    def __init__(self, routes, vehicle_capacity, num_iterations=None, time_limit=None, min_removal=None,
+                 max_removal=None, regret_k=3, segment=100, reaction=0.1, scores=(33, 9, 13),
+                 start_temperature=0.05, cooling=0.9995, verbose=True, on_iteration=None, history_mode='full',
+                 history_size=1000):
+        if num_iterations is None and time_limit is None:
+            raise ValueError("Defina num_iterations e/ou time_limit.")
+        self.routes = routes
+        self.vehicle_capacity = vehicle_capacity
+        self.demand = np.asarray(routes.get_demand(), dtype=float)
+        self.distance_matrix = routes.get_distance_matrix()
+        self.distance_array = np.asarray(self.distance_matrix, dtype=float)
+        self.num_customers = len(self.demand)
+        self.num_iterations = num_iterations
+        self.time_limit = time_limit
+        # Quantidade de clientes removidos por iteração (padrão: entre 10% e 30% dos clientes, até 60)
+        customers = self.num_customers - 1
+        self.min_removal = min_removal if min_removal is not None else max(1, min(customers // 10, 30))
+        self.max_removal = max_removal if max_removal is not None else max(self.min_removal,
+                                                                           min(int(0.3 * customers), 60))
+        self.regret_k = regret_k
+        self.segment = segment
+        self.reaction = reaction
+        self.scores = scores  # (novo melhor global, melhor que a atual, piora aceita)
+        self.start_temperature = start_temperature  # Piora relativa aceita com 50% de chance no início
+        self.cooling = cooling
+        self.verbose = verbose
+        # Chamado como on_iteration(alns, num_vehicles, iteration) a cada iteração, como no ACO_VRP
+        self.on_iteration = on_iteration
+        self.destroy_operators = [self.random_removal, self.related_removal, self.worst_removal]
+        self.repair_operators = [self.greedy_insertion, self.regret_insertion]
+        self.destroy_weights = np.ones(len(self.destroy_operators))
+        self.repair_weights = np.ones(len(self.repair_operators))
+        self.best_solution = None
+        self.best_cost = float('inf')
+        self.history = History(history_mode, history_size)
+        self.start_time = None
+        self.stop_requested = False
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def notify(self, iteration):
+        if self.on_iteration is not None:
+            self.on_iteration(self, len(self.best_solution), iteration)
+
+    def stop(self):
+        self.stop_requested = True
+
+    def should_stop(self):
+        if self.stop_requested:
+            return True
+        return self.time_limit is not None and time.perf_counter() - self.start_time >= self.time_limit
+
+    def run(self):
+        self.start_time = time.perf_counter()
+        customers = list(range(1, self.num_customers))
+        current = self.greedy_insertion([], customers)
+        current_cost = self.total_cost(current)
+        self.update_best(current, current_cost)
+        temperature = -self.start_temperature * current_cost / np.log(0.5)
+
+        destroy_scores = np.zeros(len(self.destroy_operators))
+        destroy_uses = np.zeros(len(self.destroy_operators))
+        repair_scores = np.zeros(len(self.repair_operators))
+        repair_uses = np.zeros(len(self.repair_operators))
+
+        iteration = 0
+        while (self.num_iterations is None or iteration < self.num_iterations) and not self.should_stop():
+            destroy = self.roulette(self.destroy_weights)
+            repair = self.roulette(self.repair_weights)
+            num_removed = np.random.randint(self.min_removal, self.max_removal + 1)
+
+            partial, removed = self.destroy_operators[destroy](current, num_removed)
+            candidate = self.repair_operators[repair](partial, removed)
+            candidate_cost = self.total_cost(candidate)
+
+            score = 0
+            if candidate_cost < self.best_cost - 1e-9:
+                score = self.scores[0]
+                self.update_best(candidate, candidate_cost)
+            elif candidate_cost < current_cost - 1e-9:
+                score = self.scores[1]
+            elif np.random.rand() < np.exp(-(candidate_cost - current_cost) / max(temperature, 1e-12)):
+                score = self.scores[2]
+            if score:
+                current, current_cost = candidate, candidate_cost
+
+            destroy_scores[destroy] += score
+            destroy_uses[destroy] += 1
+            repair_scores[repair] += score
+            repair_uses[repair] += 1
+            temperature *= self.cooling
+            self.history.add_cost(len(self.best_solution), iteration, self.best_cost)
+            self.notify(iteration)
+
+            iteration += 1
+            if iteration % self.segment == 0:
+                self.adapt_weights(self.destroy_weights, destroy_scores, destroy_uses)
+                self.adapt_weights(self.repair_weights, repair_scores, repair_uses)
+                self.log(f'Iteration {iteration}: Best cost = {self.best_cost}')
+
+        return self.best_solution, self.best_cost
+
+    def update_best(self, routes, cost):
+        self.best_cost = cost
+        self.best_solution = [[0] + route + [0] for route in routes]
+        self.history.add_solution(self.best_solution)
+
+    def adapt_weights(self, weights, scores, uses):
+        used = uses > 0
+        weights[used] = (1 - self.reaction) * weights[used] + self.reaction * scores[used] / uses[used]
+        weights[:] = np.maximum(weights, 1e-3)
+        scores[:] = 0
+        uses[:] = 0
+
+    @staticmethod
+    def roulette(weights):
+        return int(np.searchsorted(np.cumsum(weights), np.random.rand() * weights.sum(), side='right'))
+
+    def route_cost(self, route):
+        path = np.array([0] + route + [0])
+        return self.distance_array[path[:-1], path[1:]].sum()
+
+    def total_cost(self, routes):
+        return sum(self.route_cost(route) for route in routes)
+
+    # OPERADORES DE REMOÇÃO: recebem as rotas (apenas clientes) e devolvem (rotas parciais, removidos)
+    @staticmethod
+    def remove(routes, removed):
+        removed_set = set(removed)
+        partial = [[customer for customer in route if customer not in removed_set] for route in routes]
+        return [route for route in partial if route], list(removed)
+
+    def random_removal(self, routes, num_removed):
+        customers = np.concatenate([np.asarray(route) for route in routes])
+        removed = np.random.choice(customers, size=min(num_removed, len(customers)), replace=False)
+        return self.remove(routes, removed.tolist())
+
+    def related_removal(self, routes, num_removed):
+        # Remove os clientes mais próximos de uma semente aleatória (com ruído para diversificar)
+        customers = np.concatenate([np.asarray(route) for route in routes])
+        seed = np.random.choice(customers)
+        relatedness = self.distance_array[seed, customers] * np.random.uniform(1.0, 1.5, len(customers))
+        removed = customers[np.argsort(relatedness)[:num_removed]]
+        return self.remove(routes, removed.tolist())
+
+    def worst_removal(self, routes, num_removed):
+        # Remove os clientes cuja retirada mais economiza distância (ganho com ruído)
+        customers, gains = [], []
+        for route in routes:
+            path = np.array([0] + route + [0])
+            gains.append(self.distance_array[path[:-2], path[1:-1]] + self.distance_array[path[1:-1], path[2:]] -
+                         self.distance_array[path[:-2], path[2:]])
+            customers.append(path[1:-1])
+        customers = np.concatenate(customers)
+        gains = np.concatenate(gains) * np.random.uniform(0.8, 1.2, len(customers))
+        removed = customers[np.argsort(-gains)[:num_removed]]
+        return self.remove(routes, removed.tolist())
+
+    # OPERADORES DE INSERÇÃO
+    def greedy_insertion(self, routes, removed):
+        return self.insert(routes, removed, 1)
+
+    def regret_insertion(self, routes, removed):
+        return self.insert(routes, removed, self.regret_k)
+
+    def insertion_costs(self, route, load, customers):
+        # Custo de inserir cada cliente em cada posição da rota (vetorizado) -> (melhor custo, posição)
+        path = np.array([0] + route + [0])
+        delta = (self.distance_array[np.ix_(path[:-1], customers)] +
+                 self.distance_array[np.ix_(customers, path[1:])].T -
+                 self.distance_array[path[:-1], path[1:]][:, None])
+        positions = np.argmin(delta, axis=0)
+        costs = delta[positions, np.arange(len(customers))]
+        costs[load + self.demand[customers] > self.vehicle_capacity] = np.inf
+        return costs, positions
+
+    def insert(self, routes, removed, k):
+        # k = 1: inserção gulosa; k > 1: regret-k. A última linha da matriz de custos é "abrir nova rota".
+        routes = [list(route) for route in routes]
+        loads = [self.demand[route].sum() for route in routes]
+        customers = np.array(removed, dtype=int)
+        if len(customers) == 0:
+            return routes
+
+        rows = [self.insertion_costs(route, load, customers) for route, load in zip(routes, loads)]
+        costs = np.vstack([row[0] for row in rows] + [self.distance_array[0, customers] +
+                                                     self.distance_array[customers, 0]])
+        positions = np.vstack([row[1] for row in rows] + [np.zeros(len(customers), dtype=int)])
+
+        while len(customers):
+            if k == 1 or len(costs) == 1:
+                column = int(np.argmin(costs.min(axis=0)))
+            else:
+                ordered = np.sort(costs, axis=0)[:k]
+                regret = np.nan_to_num((ordered[1:] - ordered[0]).sum(axis=0), posinf=1e18)
+                # Maior arrependimento; empate decidido pelo menor custo de inserção
+                column = int(np.lexsort((ordered[0], -regret))[0])
+
+            row = int(np.argmin(costs[:, column]))
+            position = int(positions[row, column])
+            customer = int(customers[column])
+            customers = np.delete(customers, column)
+            costs = np.delete(costs, column, axis=1)
+            positions = np.delete(positions, column, axis=1)
+
+            if row == len(routes):
+                routes.append([customer])
+                loads.append(self.demand[customer])
+                new_costs, new_positions = self.insertion_costs(routes[row], loads[row], customers)
+                costs = np.vstack([costs[:-1], new_costs, costs[-1:]])
+                positions = np.vstack([positions[:-1], new_positions, positions[-1:]])
+            else:
+                # Apenas a rota alterada tem seus custos de inserção recalculados
+                routes[row].insert(position, customer)
+                loads[row] += self.demand[customer]
+                costs[row], positions[row] = self.insertion_costs(routes[row], loads[row], customers)
+        return routes
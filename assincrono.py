@@ -0,0 +1,95 @@
+import asyncio
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from lote import SOLVERS
+
+_DONE = object()
+
+
+def create_solver(route, solver, budget, on_iteration=None, num_ants=20, num_iterations=300, max_stagnation=20,
+                  num_vehicles=None, **params):
+    module_name, class_name = SOLVERS[solver]
+    solver_class = getattr(importlib.import_module(module_name), class_name)
+    if solver == 'google_or':
+        num_vehicles = num_vehicles or int(np.ceil(sum(route.demand) / route.capacity))
+        google_or = solver_class(route, num_vehicles)
+        if budget is not None:
+            google_or.search_parameters.time_limit.seconds = max(1, int(np.ceil(budget)))
+        return google_or
+    if solver == 'alns':
+        return solver_class(route, route.capacity, num_iterations, time_limit=budget, verbose=False,
+                            on_iteration=on_iteration, **params)
+    return solver_class(route, route.capacity, num_ants, num_iterations, max_stagnation=max_stagnation,
+                        time_limit=budget, verbose=False, on_iteration=on_iteration, **params)
+
+
+def check_executor(executor):
+    # O solver precisa rodar no mesmo processo: em um ProcessPoolExecutor ele seria copiado (pickle) para o
+    # processo filho e stop() agiria apenas sobre a cópia do processo pai, sem efeito no cancelamento
+    if executor is not None and not isinstance(executor, ThreadPoolExecutor):
+        raise TypeError(f"Use um ThreadPoolExecutor (ou None), não {type(executor).__name__}.")
+
+
+def run_google_or(google_or):
+    solution, cost = google_or.solve_problem()
+    if not solution:
+        return None, None
+    return google_or.get_routes(solution), cost
+
+
+async def solve_async(route, solver='aco', budget=None, executor=None, **params):
+    """Executa o solver em um executor sem bloquear o event loop.
+
+    Retorna o mesmo que o run() do solver. Se a tarefa for cancelada, o solver ACO/ALNS é interrompido ao fim
+    da iteração corrente (o Google OR respeita apenas o budget). O executor deve ser de threads.
+    """
+    check_executor(executor)
+    loop = asyncio.get_running_loop()
+    instance = create_solver(route, solver, budget, **params)
+    target = instance.run if solver != 'google_or' else lambda: run_google_or(instance)
+    future = loop.run_in_executor(executor, target)
+    try:
+        return await future
+    except asyncio.CancelledError:
+        if solver != 'google_or':
+            instance.stop()
+        raise
+
+
+async def iter_solutions(route, solver='aco', budget=None, executor=None, **params):
+    """Iterador assíncrono das melhores soluções intermediárias do ACO_VRP ou do ALNS_VRP.
+
+    Produz dicionários {'num_vehicles', 'iteration', 'cost', 'solution'} sempre que o melhor custo melhora.
+    Interromper a iteração (break, cancelamento) encerra o solver. O executor deve ser de threads.
+    """
+    if solver not in ('aco', 'alns'):
+        raise ValueError(f"Soluções intermediárias disponíveis apenas para 'aco' e 'alns', não '{solver}'.")
+    check_executor(executor)
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    last_cost = [float('inf')]
+
+    def on_iteration(aco, num_vehicles, iteration):
+        # Executado na thread do solver: repassa ao event loop apenas as melhorias
+        if aco.best_cost < last_cost[0]:
+            last_cost[0] = aco.best_cost
+            snapshot = {'num_vehicles': num_vehicles, 'iteration': iteration, 'cost': aco.best_cost,
+                        'solution': [list(route) for route in aco.best_solution]}
+            loop.call_soon_threadsafe(queue.put_nowait, snapshot)
+
+    aco = create_solver(route, solver, budget, on_iteration, **params)
+    future = loop.run_in_executor(executor, aco.run)
+    future.add_done_callback(lambda _: queue.put_nowait(_DONE))
+    try:
+        while True:
+            snapshot = await queue.get()
+            if snapshot is _DONE:
+                break
+            yield snapshot
+        future.result()
+    finally:
+        aco.stop()
@@ -0,0 +1,72 @@
+import argparse
+import time
+
+import numpy as np
+
+from aco import ACO_VRP
+from feromonio import AntSystem, ElitistAntSystem, MaxMinAntSystem, RankBasedAntSystem
+from rotas import Route
+
+STRATEGIES = {
+    'AS': AntSystem,
+    'EAS': ElitistAntSystem,
+    'ASrank': RankBasedAntSystem,
+    'MMAS': MaxMinAntSystem,
+}
+
+
+def run_strategy(route, strategy, seed, num_ants, num_iterations, max_stagnation):
+    curve = []
+
+    def on_iteration(aco, num_vehicles, iteration):
+        curve.append(aco.best_cost)
+
+    np.random.seed(seed)
+    aco = ACO_VRP(route, route.capacity, num_ants, num_iterations, max_stagnation=max_stagnation, verbose=False,
+                  on_iteration=on_iteration, pheromone_update=STRATEGIES[strategy]())
+    start = time.perf_counter()
+    _, best_cost = aco.run()
+    return best_cost, curve, time.perf_counter() - start
+
+
+def iterations_to_target(curve, target):
+    # Primeira iteração (1-based) cujo melhor custo atinge o alvo; None se nunca atingir
+    for iteration, cost in enumerate(curve):
+        if cost <= target:
+            return iteration + 1
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compara as estratégias de atualização do feromônio do ACO_VRP.')
+    parser.add_argument('--cities', type=int, default=30)
+    parser.add_argument('--capacity', type=int, default=12)
+    parser.add_argument('--num-ants', type=int, default=20)
+    parser.add_argument('--num-iterations', type=int, default=200)
+    parser.add_argument('--max-stagnation', type=int, default=20)
+    parser.add_argument('--seeds', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=0.02, help='Alvo = melhor custo global * (1 + tolerância)')
+    args = parser.parse_args(argv)
+
+    np.random.seed(0)
+    route = Route(args.cities, args.capacity)
+    route.create_routes()
+
+    results = {name: [run_strategy(route, name, seed, args.num_ants, args.num_iterations, args.max_stagnation)
+                      for seed in range(args.seeds)] for name in STRATEGIES}
+    target = min(cost for runs in results.values() for cost, _, _ in runs) * (1 + args.tolerance)
+
+    print(f'Alvo: {target:.1f} ({args.seeds} sementes, {args.cities} cidades)')
+    print(f'{"Estratégia":<10} {"Custo médio":>12} {"Melhor":>8} {"Atingiu":>8} {"Iter. médias":>13}'
+          f' {"Tempo (s)":>10}')
+    for name, runs in results.items():
+        costs = [cost for cost, _, _ in runs]
+        hits = [iterations_to_target(curve, target) for _, curve, _ in runs]
+        hits = [hit for hit in hits if hit is not None]
+        mean_hits = f'{np.mean(hits):.1f}' if hits else '-'
+        print(f'{name:<10} {np.mean(costs):>12.1f} {min(costs):>8.1f} {len(hits):>5}/{len(runs):<2} {mean_hits:>13}'
+              f' {np.mean([elapsed for _, _, elapsed in runs]):>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import json
+import subprocess
+import sys
+
+# Módulos do núcleo (usados pelos workers) e dependências pesadas que eles não podem carregar
+CORE_MODULES = ['aco', 'alns', 'rotas', 'lote', 'assincrono']
+HEAVY_MODULES = ['matplotlib', 'ortools', 'optuna']
+
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+rss = None
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+except ImportError:
+    pass
+print(json.dumps({{"elapsed": elapsed, "heavy": heavy, "rss_mb": rss}}))
+'''
+
+
+def measure(modules, repeat):
+    # Cada medição roda em um interpretador novo, para não reaproveitar módulos já importados
+    code = PROBE.format(modules=modules, heavy=HEAVY_MODULES)
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        samples.append(json.loads(output.stdout))
+    return min(samples, key=lambda sample: sample['elapsed'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Mede o tempo de importação do núcleo headless dos solvers.')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=0.5,
+                        help='Falha se a importação do núcleo levar mais que isso')
+    args = parser.parse_args(argv)
+
+    result = measure(CORE_MODULES, args.repeat)
+    message = f"Importação de {', '.join(CORE_MODULES)}: {result['elapsed'] * 1000:.1f} ms"
+    if result['rss_mb'] is not None:
+        message += f" | RSS máximo: {result['rss_mb']:.1f} MB"
+    print(message)
+
+    failed = False
+    if result['heavy']:
+        print(f"ERRO: dependências pesadas carregadas pelo núcleo: {', '.join(result['heavy'])}")
+        failed = True
+    if result['elapsed'] > args.max_seconds:
+        print(f'ERRO: importação acima do limite de {args.max_seconds} s')
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+import numpy as np
+
+from lote import solve_batch
+
+
+class Decomposition_VRP:
+    """Decomposição espacial (cluster-first, route-second) para instâncias muito grandes.
+
+    Os clientes são particionados por ângulo em torno do depósito ('sweep') ou por k-means nas coordenadas
+    ('kmeans'); cada partição vira uma sub-Route independente (com matriz densa apenas do seu tamanho),
+    resolvida em paralelo pelo solver escolhido via lote.solve_batch. As rotas são então unidas e as
+    fronteiras entre partições vizinhas são reotimizadas com o ALNS.
+
+    A Route de entrada só precisa de coordinates e demand: a matriz n x n completa nunca é construída.
+    """
+
+    def __init__(self, routes, vehicle_capacity, solver='aco', method='sweep', max_partition_size=150,
+                 workers=None, time_limit=None, border_routes=2, border_time_limit=5, verbose=True, **params):
+        if method not in ('sweep', 'kmeans'):
+            raise ValueError(f"Método de particionamento desconhecido: {method}")
+        self.routes = routes
+        self.vehicle_capacity = vehicle_capacity
+        self.coordinates = np.asarray(routes.get_coordinates())
+        self.demand = np.asarray(routes.get_demand())
+        self.solver = solver
+        self.method = method
+        self.max_partition_size = max_partition_size
+        self.workers = workers
+        self.time_limit = time_limit  # Orçamento por partição
+        self.border_routes = border_routes  # Rotas de cada lado da fronteira reotimizadas juntas
+        self.border_time_limit = border_time_limit
+        self.verbose = verbose
+        self.params = params  # Repassados a lote.solve_batch (num_ants, num_iterations, ...)
+        self.partitions = []
+        self.best_solution = None
+        self.best_cost = float('inf')
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def run(self):
+        customers = np.arange(1, len(self.coordinates))
+        num_partitions = max(1, int(np.ceil(len(customers) / self.max_partition_size)))
+        if self.method == 'sweep':
+            self.partitions = self.sweep_partition(customers, num_partitions)
+        else:
+            self.partitions = self.kmeans_partition(customers, num_partitions)
+        self.log(f'{"-="*15} {len(self.partitions)} partitions ({self.method}) {"=-"*15}')
+
+        routes_by_partition = self.solve_subproblems(self.partitions, self.solver, self.time_limit, self.params)
+        if self.border_routes and len(self.partitions) > 1:
+            routes_by_partition = self.improve_borders(routes_by_partition)
+
+        self.best_solution = [route for routes in routes_by_partition for route in routes]
+        self.best_cost = sum(self.route_cost(route) for route in self.best_solution)
+        return self.best_solution, self.best_cost
+
+    # PARTICIONAMENTO
+    def sweep_partition(self, customers, num_partitions):
+        # Ordena por ângulo em torno do depósito, começando após o maior vão angular, e corta em setores
+        offsets = self.coordinates[customers] - self.coordinates[0]
+        angles = np.arctan2(offsets[:, 1], offsets[:, 0])
+        order = np.argsort(angles)
+        gaps = np.diff(np.append(angles[order], angles[order[0]] + 2 * np.pi))
+        order = np.roll(order, -(int(np.argmax(gaps)) + 1))
+        return [customers[sector] for sector in np.array_split(order, num_partitions) if len(sector)]
+
+    def kmeans_partition(self, customers, num_partitions, max_iterations=50):
+        points = self.coordinates[customers].astype(float)  # Centróides são médias: não truncar
+        # Inicialização k-means++
+        centroids = [points[np.random.randint(len(points))]]
+        for _ in range(1, num_partitions):
+            distances = np.min([((points - centroid) ** 2).sum(axis=1) for centroid in centroids], axis=0)
+            centroids.append(points[np.random.choice(len(points), p=distances / distances.sum())
+                                    if distances.sum() > 0 else np.random.randint(len(points))])
+        centroids = np.array(centroids)
+
+        labels = np.zeros(len(points), dtype=int)
+        for iteration in range(max_iterations):
+            distances = ((points[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+            new_labels = np.argmin(distances, axis=1)
+            if iteration > 0 and np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+            for cluster in range(num_partitions):
+                members = points[labels == cluster]
+                # Cluster vazio: recomeça no ponto mais distante do seu centróide atual
+                centroids[cluster] = members.mean(axis=0) if len(members) else \
+                    points[np.argmax(distances[np.arange(len(points)), labels])]
+        # O k-means não limita o tamanho dos clusters: os que excedem max_partition_size são cortados por sweep
+        partitions = []
+        for cluster in range(num_partitions):
+            members = customers[labels == cluster]
+            if len(members) > self.max_partition_size:
+                partitions += self.sweep_partition(members, int(np.ceil(len(members) / self.max_partition_size)))
+            elif len(members):
+                partitions.append(members)
+        return partitions
+
+    # SUBPROBLEMAS
+    def sub_instance(self, name, customers):
+        # Sub-Route serializada: depósito + clientes da partição (a matriz é calculada no worker). As
+        # coordenadas mantêm o tipo original, para o worker usar a mesma métrica de route_cost
+        nodes = np.concatenate([[0], customers])
+        return {'name': name, 'capacity': self.vehicle_capacity,
+                'coordinates': self.coordinates[nodes].tolist(),
+                'demand': self.demand[nodes].tolist()}
+
+    def solve_subproblems(self, partitions, solver, time_limit, params, label='Partition', strict=True):
+        # strict=False: partições que nem o ALNS resolve ficam como None em vez de interromper a execução
+        instances = [self.sub_instance(index, customers) for index, customers in enumerate(partitions)]
+        routes_by_partition = [None] * len(partitions)
+        failed = []
+        for result in solve_batch(instances, solver, self.workers, time_limit, **params):
+            index = result['name']
+            if result.get('solution') is None:
+                failed.append(index)
+                continue
+            # Converte os índices locais da sub-Route de volta para os índices originais, descartando os retornos
+            # intermediários ao depósito (ex.: [0, 2, 11, 0, 0] do ACO), que entrariam nas fronteiras como clientes
+            nodes = np.concatenate([[0], partitions[index]])
+            routes = [[int(nodes[location]) for location in route if location != 0] for route in result['solution']]
+            routes_by_partition[index] = [[0] + route + [0] for route in routes if route]
+            self.log(f'{label} {index}: {len(partitions[index])} customers, cost = {result.get("cost")}')
+
+        if failed:
+            if solver == 'alns':
+                if strict:
+                    raise ValueError(f"Partições sem solução: {sorted(failed)}")
+                self.log(f'{label} {sorted(failed)}: no solution, skipped')
+                return routes_by_partition
+            # O ALNS sempre encontra solução viável (abre novas rotas quando preciso)
+            self.log(f'Partitions {sorted(failed)} without a solution from {solver}; retrying with ALNS')
+            retried = self.solve_subproblems([partitions[index] for index in failed], 'alns', time_limit,
+                                             {'num_iterations': None if time_limit else 1000}, f'{label} retry')
+            for index, routes in zip(failed, retried):
+                routes_by_partition[index] = routes
+        return routes_by_partition
+
+    def route_cost(self, route):
+        # Manhattan, como Route.add_distance_manhattan, sem depender da matriz completa
+        path = self.coordinates[route]
+        return np.abs(np.diff(path, axis=0)).sum()
+
+    def route_centroid(self, route):
+        return self.coordinates[route[1:-1]].mean(axis=0)
+
+    # FRONTEIRAS
+    def neighbour_pairs(self, routes_by_partition):
+        # Pares de partições vizinhas: setores consecutivos no sweep; no k-means, cada partição com a de
+        # centróide mais próximo
+        count = len(routes_by_partition)
+        if self.method == 'sweep':
+            return sorted({tuple(sorted((index, (index + 1) % count))) for index in range(count)})
+        centroids = np.array([self.coordinates[partition].mean(axis=0) for partition in self.partitions])
+        distances = ((centroids[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+        np.fill_diagonal(distances, np.inf)
+        return sorted({tuple(sorted((index, int(np.argmin(distances[index]))))) for index in range(count)})
+
+    def improve_borders(self, routes_by_partition):
+        # Em cada par de vizinhas, junta as border_routes rotas de cada lado mais próximas da outra partição e
+        # as reotimiza com o ALNS; a troca só é aceita se reduzir o custo. Cada rota entra em no máximo um par.
+        used = set()
+        groups = []
+        partition_centroids = [self.coordinates[partition].mean(axis=0) for partition in self.partitions]
+        for first, second in self.neighbour_pairs(routes_by_partition):
+            selected = []
+            for own, other in ((first, second), (second, first)):
+                candidates = [index for index in range(len(routes_by_partition[own])) if (own, index) not in used]
+                candidates.sort(key=lambda index: np.abs(self.route_centroid(routes_by_partition[own][index]) -
+                                                         partition_centroids[other]).sum())
+                selected += [(own, index) for index in candidates[:self.border_routes]]
+            if len(selected) > 1:
+                used.update(selected)
+                groups.append(selected)
+        if not groups:
+            return routes_by_partition
+
+        border_customers = [np.array([customer for partition, index in group
+                                      for customer in routes_by_partition[partition][index][1:-1]])
+                            for group in groups]
+        # Sem orçamento de tempo, o ALNS precisa de um número de iterações (como no retry das partições)
+        improved = self.solve_subproblems(border_customers, 'alns', self.border_time_limit,
+                                          {'num_iterations': None if self.border_time_limit else 1000},
+                                          'Border group', strict=False)
+
+        removed = set()
+        for group, new_routes in zip(groups, improved):
+            if new_routes is None:
+                continue  # Grupo sem solução: mantém as rotas originais
+            old_cost = sum(self.route_cost(routes_by_partition[partition][index]) for partition, index in group)
+            new_cost = sum(self.route_cost(route) for route in new_routes)
+            if new_cost < old_cost:
+                self.log(f'Border {group[0][0]}-{group[-1][0]}: {old_cost} -> {new_cost}')
+                removed.update(group)
+                routes_by_partition[group[0][0]] = routes_by_partition[group[0][0]] + new_routes
+
+        return [[route for index, route in enumerate(routes) if (partition, index) not in removed]
+                for partition, routes in enumerate(routes_by_partition)]
@@ -0,0 +1,135 @@
+import numpy as np
+
+
+def solution_edges(solution):
+    # Arestas (origem, destino) de todas as rotas da solução, como arrays de índices
+    src = np.concatenate([np.asarray(route[:-1], dtype=int) for route in solution])
+    dst = np.concatenate([np.asarray(route[1:], dtype=int) for route in solution])
+    return src, dst
+
+
+class AntSystem:
+    """Ant System: todas as formigas depositam Q / custo (regra original do ACO_VRP)."""
+
+    def reset(self, aco):
+        return np.ones((aco.num_customers, aco.num_customers))
+
+    def forget_best(self):
+        # Chamado quando a instância muda: soluções guardadas passam a ter índices inválidos
+        pass
+
+    def evaluate(self, aco, solutions):
+        edges = [solution_edges(solution) for solution in solutions]
+        if hasattr(aco, 'pheromone_costs'):
+            # MO_ACO_VRPT: o depósito é guiado por distância + tempo
+            return edges, aco.pheromone_costs(solutions)
+        costs = np.array([aco.distance_array[src, dst].sum() for src, dst in edges])
+        return edges, costs
+
+    def deposit(self, aco, edges, amounts):
+        # Um único np.add.at para todas as arestas de todas as soluções depositantes
+        if not edges:
+            return
+        src = np.concatenate([edge[0] for edge in edges])
+        dst = np.concatenate([edge[1] for edge in edges])
+        weights = np.concatenate([np.full(len(edge[0]), amount) for edge, amount in zip(edges, amounts)])
+        np.add.at(aco.pheromone, (src, dst), weights)
+
+    def update(self, aco, solutions):
+        edges, costs = self.evaluate(aco, solutions)
+        aco.pheromone *= (1 - aco.rho)
+        self.deposit(aco, edges, aco.Q / costs)
+
+
+class ElitistAntSystem(AntSystem):
+    """Ant System com reforço extra de elite_weight * Q / custo na melhor solução encontrada até agora."""
+
+    def __init__(self, elite_weight=None):
+        self.elite_weight = elite_weight  # None = número de formigas
+        self.best_edges = None
+        self.best_cost = float('inf')
+
+    def forget_best(self):
+        self.best_edges = None
+        self.best_cost = float('inf')
+
+    def update_best(self, edges, costs):
+        index = int(np.argmin(costs))
+        if costs[index] < self.best_cost:
+            self.best_cost = costs[index]
+            self.best_edges = edges[index]
+
+    def update(self, aco, solutions):
+        edges, costs = self.evaluate(aco, solutions)
+        self.update_best(edges, costs)
+        elite_weight = self.elite_weight if self.elite_weight is not None else aco.num_ants
+        aco.pheromone *= (1 - aco.rho)
+        self.deposit(aco, edges + [self.best_edges], np.append(aco.Q / costs, elite_weight * aco.Q / self.best_cost))
+
+
+class RankBasedAntSystem(ElitistAntSystem):
+    """Rank-based AS: apenas as w - 1 melhores formigas depositam, com peso (w - r); a melhor global deposita w."""
+
+    def __init__(self, w=6):
+        super().__init__()
+        self.w = w
+
+    def update(self, aco, solutions):
+        edges, costs = self.evaluate(aco, solutions)
+        self.update_best(edges, costs)
+        ranking = np.argsort(costs)[:self.w - 1]
+        amounts = (self.w - 1 - np.arange(len(ranking))) * aco.Q / costs[ranking]
+        aco.pheromone *= (1 - aco.rho)
+        self.deposit(aco, [edges[i] for i in ranking] + [self.best_edges],
+                     np.append(amounts, self.w * aco.Q / self.best_cost))
+
+
+class MaxMinAntSystem(ElitistAntSystem):
+    """MAX-MIN AS: só a melhor solução deposita e as trilhas ficam limitadas a [tau_min, tau_max].
+
+    As trilhas começam em tau_max e são reinicializadas quando a melhor solução global não melhora por
+    stagnation_limit iterações.
+    """
+
+    def __init__(self, p_best=0.05, stagnation_limit=20, global_best_every=5):
+        super().__init__()
+        self.p_best = p_best
+        self.stagnation_limit = stagnation_limit
+        # A cada global_best_every iterações deposita a melhor global; nas demais, a melhor da iteração
+        self.global_best_every = global_best_every
+        self.iteration = 0
+        self.stagnation = 0
+        self.initialized = False
+
+    def reset(self, aco):
+        self.initialized = False
+        return super().reset(aco)
+
+    def bounds(self, aco):
+        tau_max = aco.Q / (aco.rho * self.best_cost)
+        n = aco.num_customers
+        p_root = self.p_best ** (1.0 / n)
+        tau_min = tau_max * (1 - p_root) / ((n / 2 - 1) * p_root) if n > 2 else 0.0
+        return min(tau_min, tau_max), tau_max
+
+    def update(self, aco, solutions):
+        edges, costs = self.evaluate(aco, solutions)
+        best_cost_before = self.best_cost
+        self.update_best(edges, costs)
+        self.stagnation = self.stagnation + 1 if self.best_cost == best_cost_before else 0
+        self.iteration += 1
+        tau_min, tau_max = self.bounds(aco)
+
+        if not self.initialized or self.stagnation >= self.stagnation_limit:
+            aco.pheromone.fill(tau_max)
+            self.initialized = True
+            self.stagnation = 0
+            return
+
+        aco.pheromone *= (1 - aco.rho)
+        if self.iteration % self.global_best_every == 0:
+            self.deposit(aco, [self.best_edges], [aco.Q / self.best_cost])
+        else:
+            index = int(np.argmin(costs))
+            self.deposit(aco, [edges[index]], [aco.Q / costs[index]])
+        np.clip(aco.pheromone, tau_min, tau_max, out=aco.pheromone)
@@ -0,0 +1,127 @@
+from collections import deque
+
+import numpy as np
+
+MODES = ('full', 'ring', 'log', 'off')
+
+
+def encode_solution(solution):
+    # Forma compacta: todas as rotas concatenadas em um array int32 + o tamanho de cada rota.
+    # O MO_ACO_VRP guarda (num_vehicles, solution); o número de veículos é mantido à parte.
+    num_vehicles = None
+    if isinstance(solution, tuple):
+        num_vehicles, solution = solution
+    lengths = np.array([len(route) for route in solution], dtype=np.int32)
+    nodes = np.concatenate([np.asarray(route, dtype=np.int32) for route in solution]) if solution else \
+        np.empty(0, dtype=np.int32)
+    return num_vehicles, nodes, lengths
+
+
+def decode_solution(encoded):
+    num_vehicles, nodes, lengths = encoded
+    solution = [route.tolist() for route in np.split(nodes, np.cumsum(lengths)[:-1])] if len(lengths) else []
+    return solution if num_vehicles is None else (num_vehicles, solution)
+
+
+class History:
+    """Histórico de custos e melhores soluções do ACO com memória limitada.
+
+    Modos:
+        'full': guarda tudo (comportamento original);
+        'ring': apenas os últimos size registros;
+        'log':  amostragem logarítmica (registro k guardado quando k alcança um limiar que cresce
+                geometricamente pelo fator ratio), denso no início e esparso no fim; o último registro é
+                sempre mantido;
+        'off':  não guarda nada.
+
+    Os custos ficam em um array NumPy pré-alocado (num_vehicles, iteration, cost) e as soluções na forma
+    compacta de encode_solution. history["cost"] e history["solution"] mantêm a interface de listas original.
+    """
+
+    def __init__(self, mode='full', size=1000, ratio=1.1):
+        if mode not in MODES:
+            raise ValueError(f"Modo de histórico desconhecido: {mode}")
+        self.mode = mode
+        self.size = size
+        self.ratio = ratio
+        self.costs = np.empty((size if mode == 'ring' else 64, 3))
+        self.num_costs = 0  # Registros de custo recebidos (guardados ou não)
+        self.stored_costs = 0
+        self.next_cost = 0
+        self.pending_cost = None  # Último custo não amostrado no modo 'log'
+        self.solutions = deque(maxlen=size if mode == 'ring' else None)
+        self.num_solutions = 0
+        self.next_solution = 0
+        self.pending_solution = None  # Última solução não amostrada no modo 'log'
+
+    def next_threshold(self, index):
+        return max(index + 1, int(index * self.ratio))
+
+    def add_cost(self, num_vehicles, iteration, cost):
+        if self.mode == 'off':
+            return
+        index = self.num_costs
+        self.num_costs += 1
+        entry = (num_vehicles, iteration, cost)
+        if self.mode == 'log':
+            if index < self.next_cost:
+                self.pending_cost = entry
+                return
+            self.next_cost = self.next_threshold(index)
+            self.pending_cost = None
+
+        if self.mode == 'ring':
+            self.costs[index % self.size] = entry
+            self.stored_costs = min(self.num_costs, self.size)
+            return
+        if self.stored_costs == len(self.costs):
+            self.costs = np.resize(self.costs, (2 * len(self.costs), 3))
+        self.costs[self.stored_costs] = entry
+        self.stored_costs += 1
+
+    def add_solution(self, solution):
+        if self.mode == 'off':
+            return
+        index = self.num_solutions
+        self.num_solutions += 1
+        encoded = encode_solution(solution)
+        if self.mode == 'log':
+            if index < self.next_solution:
+                self.pending_solution = encoded
+                return
+            self.next_solution = self.next_threshold(index)
+            self.pending_solution = None
+        self.solutions.append(encoded)
+
+    def map_solutions(self, function):
+        # Reescreve as soluções guardadas (ex.: renumeração após remover um cliente da instância)
+        self.solutions = deque((encode_solution(function(decode_solution(encoded))) for encoded in self.solutions),
+                               maxlen=self.solutions.maxlen)
+        if self.pending_solution is not None:
+            self.pending_solution = encode_solution(function(decode_solution(self.pending_solution)))
+
+    def cost_array(self):
+        # Registros em ordem cronológica, incluindo o último (no modo 'log' ele pode não ter sido amostrado)
+        if self.mode == 'ring' and self.num_costs > self.size:
+            start = self.num_costs % self.size
+            costs = np.concatenate([self.costs[start:], self.costs[:start]])
+        else:
+            costs = self.costs[:self.stored_costs]
+        if self.pending_cost is not None:
+            costs = np.vstack([costs, self.pending_cost])
+        return costs
+
+    def solution_list(self):
+        solutions = [decode_solution(encoded) for encoded in self.solutions]
+        if self.pending_solution is not None:
+            solutions.append(decode_solution(self.pending_solution))
+        return solutions
+
+    def __getitem__(self, key):
+        # Compatibilidade com o antigo dicionário {"cost": [...], "solution": [...]}
+        if key == 'cost':
+            return [(int(num_vehicles), int(iteration), float(cost))
+                    for num_vehicles, iteration, cost in self.cost_array()]
+        if key == 'solution':
+            return self.solution_list()
+        raise KeyError(key)
@@ -0,0 +1,179 @@
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from rotas import route_from_dict
+
+# Nome do solver -> (módulo, classe). O módulo só é importado dentro dos workers.
+SOLVERS = {
+    'aco': ('aco', 'ACO_VRP'),
+    'mo_aco_vrpt': ('aco', 'MO_ACO_VRPT'),
+    'google_or': ('ortools_google', 'Google_OR_VRP'),
+    'alns': ('alns', 'ALNS_VRP'),
+}
+
+_solver_class = None
+
+
+def init_worker(solver_name):
+    # Executado uma vez por processo: o custo de importação é pago apenas na criação do worker
+    global _solver_class
+    module_name, class_name = SOLVERS[solver_name]
+    _solver_class = getattr(importlib.import_module(module_name), class_name)
+
+
+def solve_instance(solver_name, instance, params):
+    name = instance.get('name')
+    route = route_from_dict(instance)
+    time_limit = params.get('time_limit')
+    start = time.perf_counter()
+    result = {'name': name, 'solver': solver_name}
+
+    if solver_name == 'google_or':
+        num_vehicles = instance.get('num_vehicles') or params.get('num_vehicles') or \
+            int(np.ceil(sum(route.demand) / route.capacity))
+        solver = _solver_class(route, num_vehicles)
+        if time_limit is not None:
+            solver.search_parameters.time_limit.seconds = max(1, int(np.ceil(time_limit)))
+        solution, cost = solver.solve_problem()
+        result['solution'] = solver.get_routes(solution) if solution else None
+        result['cost'] = cost
+    elif solver_name == 'alns':
+        solver = _solver_class(route, route.capacity, num_iterations=params['num_iterations'], time_limit=time_limit,
+                               verbose=False)
+        result['solution'], result['cost'] = solver.run()
+    else:
+        options = {}
+        if solver_name == 'mo_aco_vrpt':
+            # Restrições de tempo opcionais definidas na própria instância
+            options = {key: instance[key] for key in ('max_route_time', 'time_windows') if key in instance}
+        solver = _solver_class(route, route.capacity, num_ants=params['num_ants'],
+                               num_iterations=params['num_iterations'], max_stagnation=params['max_stagnation'],
+                               time_limit=time_limit, verbose=False, **options)
+        if solver_name == 'mo_aco_vrpt':
+            pareto_front, solutions = solver.run()
+            result['pareto_front'] = pareto_front
+            result['solution'] = solutions
+        else:
+            solution, cost = solver.run()
+            result['solution'] = solution
+            result['cost'] = cost if solution is not None else None
+
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+def read_instances(source):
+    # Diretório com arquivos .json (uma instância por arquivo) ou fluxo JSONL ('-' = stdin)
+    if os.path.isdir(source):
+        for file_name in sorted(os.listdir(source)):
+            if file_name.endswith('.json'):
+                with open(os.path.join(source, file_name)) as file:
+                    instance = json.load(file)
+                instance.setdefault('name', os.path.splitext(file_name)[0])
+                yield instance
+        return
+
+    stream = sys.stdin if source == '-' else open(source)
+    try:
+        for index, line in enumerate(stream):
+            if line.strip():
+                instance = json.loads(line)
+                instance.setdefault('name', str(index))
+                yield instance
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def to_builtin(value):
+    # Converte tipos NumPy que o json não sabe serializar
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f'Tipo não serializável: {type(value).__name__}')
+
+
+def solve_batch(instances, solver_name='aco', workers=None, time_limit=None, num_vehicles=None,
+                num_ants=20, num_iterations=300, max_stagnation=20):
+    """Resolve as instâncias em um pool de processos, produzindo os resultados à medida que terminam."""
+    params = {'time_limit': time_limit, 'num_vehicles': num_vehicles, 'num_ants': num_ants,
+              'num_iterations': num_iterations, 'max_stagnation': max_stagnation}
+    workers = workers or os.cpu_count()
+    instances = iter(instances)
+    pending = {}
+    broken = []  # (instância, erro) que não pôde ser enviada porque o pool quebrou
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(solver_name,)) as executor:
+        def submit_next():
+            if broken:
+                return False
+            instance = next(instances, None)
+            if instance is None:
+                return False
+            try:
+                future = executor.submit(solve_instance, solver_name, instance, params)
+            except BrokenProcessPool as error:
+                # Um worker morreu (ex.: falta de memória): o pool não aceita mais tarefas
+                broken.append((instance, error))
+                return False
+            pending[future] = instance.get('name')
+            return True
+
+        # Mantém no máximo 2 instâncias por worker em voo, para não carregar todo o fluxo na memória
+        for _ in range(2 * workers):
+            if not submit_next():
+                break
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    yield future.result()
+                except Exception as error:
+                    yield {'name': name, 'solver': solver_name, 'error': repr(error)}
+                submit_next()
+
+    # Com o pool quebrado, as instâncias restantes são reportadas como erro em vez de interromper o fluxo
+    if broken:
+        instance, error = broken[0]
+        while instance is not None:
+            yield {'name': instance.get('name'), 'solver': solver_name, 'error': repr(error)}
+            instance = next(instances, None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Resolve várias instâncias de VRP em paralelo (saída JSONL).')
+    parser.add_argument('source', help="Diretório com arquivos .json, arquivo JSONL ou '-' para stdin")
+    parser.add_argument('--solver', choices=sorted(SOLVERS), default='aco')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--time-limit', type=float, default=None, help='Orçamento de tempo (s) por instância')
+    parser.add_argument('--num-vehicles', type=int, default=None, help='Frota usada pelo Google OR')
+    parser.add_argument('--num-ants', type=int, default=20)
+    parser.add_argument('--num-iterations', type=int, default=300)
+    parser.add_argument('--max-stagnation', type=int, default=20)
+    parser.add_argument('--output', default='-', help="Arquivo JSONL de saída ('-' = stdout)")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        for result in solve_batch(read_instances(args.source), args.solver, args.workers, args.time_limit,
+                                  args.num_vehicles, args.num_ants, args.num_iterations, args.max_stagnation):
+            output.write(json.dumps(result, default=to_builtin) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,9 @@
 import numpy as np
 
 from aco import ACO_VRP, MO_ACO_VRP, MO_ACO_VRPT
-from ortools_google import Google_OR_VRP
 from rotas import Route, Route_Time
-from visualizacao import Visualizacao
+
+# ortools_google (OR-Tools) e visualizacao (matplotlib) são importados apenas nas seções que os utilizam
 
 cities = 17  # 15
 vehicle_capacity = 12
@@ -24,6 +24,8 @@ routes.create_routes()
 routes_time.create_routes()
 
 # ACO BASE
+# from visualizacao import Visualizacao
+#
 # aco = ACO_VRP(routes, vehicle_capacity, num_ants=num_ants, num_iterations=num_iterations, max_stagnation=max_stagnation)
 # best_solution, best_cost = aco.run()
 #
@@ -47,6 +49,8 @@ routes_time.create_routes()
 
 
 # ACO MULTIOBJETIVO: DISTÂNCIA X TEMPO
+# from visualizacao import Visualizacao
+#
 # mo_aco_2 = MO_ACO_VRPT(routes_time, vehicle_capacity, num_ants=num_ants, num_iterations=num_iterations,
 #                        max_stagnation=max_stagnation)
 # pareto, solutions = mo_aco_2.run()
@@ -65,6 +69,9 @@ routes_time.create_routes()
 
 
 # GOOGLE OR (Operation Research)
+# from ortools_google import Google_OR_VRP
+# from visualizacao import Visualizacao
+#
 # google_or = Google_OR_VRP(routes, 3)
 # solucao, custo = google_or.solve_problem()
 #
@@ -80,6 +87,8 @@ routes_time.create_routes()
 
 
 # COMPARAR SOLUÇÕES
+from ortools_google import Google_OR_VRP  # noqa: E402
+
 aco = ACO_VRP(routes, vehicle_capacity, num_ants=num_ants, num_iterations=num_iterations, max_stagnation=max_stagnation)
 best_solution, best_cost = aco.run()
 google_or = Google_OR_VRP(routes, 6)
@@ -94,6 +103,8 @@ if solucao:
     google_or.print_solution(solucao)
     print(f'Custo: {custo} Km')
 
+    from visualizacao import Visualizacao
+
     visualizacao = Visualizacao(routes, aco_vrp=aco, solution=solution_Google_OR)
     visualizacao.plot_cities()
     visualizacao.plot_solution()
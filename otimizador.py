@@ -1,6 +1,3 @@
-import optuna
-from optuna.visualization import plot_pareto_front
-
 from aco import ACO_VRP
 from rotas import Route
 
@@ -47,6 +44,9 @@ def objective2(trial):
 
 
 if __name__ == '__main__':
+    # optuna só é necessário para executar os estudos, não para importar as funções objetivo
+    import optuna
+
     # Aqui você cria seu teste e define se cada objetivo é de maximização ou minimização
     study1 = optuna.create_study(directions=["maximize", "minimize"])
     study2 = optuna.create_study(directions=["minimize"])
@@ -60,6 +60,7 @@ if __name__ == '__main__':
     # print(study1.best_trials[-1])
 
     # Gera o pareto front
+    # from optuna.visualization import plot_pareto_front
     # plot_pareto_front(study1)
 
     study2.optimize(objective2, timeout=60, n_jobs=1)
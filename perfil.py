@@ -0,0 +1,133 @@
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import time
+import tracemalloc
+from collections import defaultdict
+from functools import wraps
+
+# Métodos cronometrados quando presentes no solver (ACO_VRP, MO_ACO_VRP e MO_ACO_VRPT)
+PHASES = ('construct_solutions', 'construct_solution', 'select_next_customer', 'update_pheromone',
+          'update_best_solution', 'calculate_cost', '_construct_solutions', '_construct_solution',
+          '_select_next_customer', '_update_pheromone', '_evaluate_solution')
+
+# Numeração dos relatórios compartilhada por todos os Profiler do processo
+_report_ids = itertools.count(1)
+
+
+class Profiler:
+    """Instrumentação opcional do ACO: contadores, tempo por fase e captura cProfile/tracemalloc.
+
+    Desligada por padrão: só é ativada passando profiler=Profiler(...) ao solver, que então tem os métodos
+    de PHASES substituídos (na instância) por versões cronometradas. Sem profiler, o custo é nulo.
+    """
+
+    def __init__(self, capture=None, report_dir=None, top=25):
+        if capture not in (None, 'cprofile', 'tracemalloc'):
+            raise ValueError(f"Modo de captura desconhecido: {capture}")
+        self.capture = capture
+        self.report_dir = report_dir
+        self.top = top
+        self.runs = 0
+        self.reset()
+
+    def reset(self):
+        self.counters = defaultdict(int)
+        self.calls = defaultdict(int)
+        self.timers = defaultdict(float)
+        self.capture_report = ''
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def timed(self, name, function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.timers[name] += time.perf_counter() - start
+                self.calls[name] += 1
+        return wrapper
+
+    def attach(self, aco):
+        for name in PHASES:
+            if hasattr(aco, name):
+                setattr(aco, name, self.timed(name, getattr(aco, name)))
+        aco.run = self.profiled_run(aco.run)
+
+    def profiled_run(self, run):
+        @wraps(run)
+        def wrapper(*args, **kwargs):
+            self.reset()
+            self.runs += 1
+            profile = cProfile.Profile() if self.capture == 'cprofile' else None
+            if profile is not None:
+                profile.enable()
+            elif self.capture == 'tracemalloc':
+                tracemalloc.start()
+            start = time.perf_counter()
+            try:
+                return run(*args, **kwargs)
+            finally:
+                self.timers['run'] = time.perf_counter() - start
+                if profile is not None:
+                    profile.disable()
+                    self.capture_report = self.format_cprofile(profile)
+                elif self.capture == 'tracemalloc':
+                    self.capture_report = self.format_tracemalloc(tracemalloc.take_snapshot())
+                    tracemalloc.stop()
+                if self.report_dir is not None:
+                    self.write_report()
+        return wrapper
+
+    def format_cprofile(self, profile):
+        stream = io.StringIO()
+        pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(self.top)
+        return stream.getvalue()
+
+    def format_tracemalloc(self, snapshot):
+        lines = [f'Pico de memória: {tracemalloc.get_traced_memory()[1] / 1024:.1f} KiB']
+        lines += [str(stat) for stat in snapshot.statistics('lineno')[:self.top]]
+        return '\n'.join(lines)
+
+    def summary(self):
+        # Razões úteis para ajustar max_stagnation, num_ants e o tamanho da frota
+        # steps conta apenas os clientes inseridos pelas construções concluídas; o trabalho das tentativas
+        # reiniciadas fica em discarded_steps
+        attempts = self.calls['construct_solution'] or self.calls['_construct_solution']
+        summary = dict(self.counters)
+        if attempts:
+            summary['restarts_per_construction'] = self.counters['restarts'] / attempts
+            summary['discarded_steps_per_construction'] = self.counters['discarded_steps'] / attempts
+        if self.counters['constructions']:
+            summary['steps_per_ant'] = self.counters['steps'] / self.counters['constructions']
+        return summary
+
+    def report(self):
+        lines = [f'{"-=" * 15} Execução {self.runs} {"=-" * 15}', 'Tempo por fase (s, inclusivo):']
+        for name, elapsed in sorted(self.timers.items(), key=lambda item: -item[1]):
+            lines.append(f'  {name:<24} {elapsed:>10.4f}  ({self.calls.get(name, 1)} chamadas)')
+        lines.append('Contadores:')
+        for name, value in sorted(self.summary().items()):
+            lines.append(f'  {name:<24} {value:>10.2f}' if isinstance(value, float) else f'  {name:<24} {value:>10}')
+        if self.capture_report:
+            lines += ['', self.capture_report]
+        return '\n'.join(lines)
+
+    def write_report(self):
+        # Um arquivo por execução: PID e horário distinguem processos (os workers do lote reutilizam PIDs), o
+        # contador distingue solvers do mesmo processo e a criação exclusiva evita sobrescrever qualquer colisão
+        os.makedirs(self.report_dir, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        while True:
+            path = os.path.join(self.report_dir, f'perfil_{os.getpid()}_{stamp}_{next(_report_ids)}.txt')
+            try:
+                with open(path, 'x') as file:
+                    file.write(self.report())
+                return path
+            except FileExistsError:
+                continue
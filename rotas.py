@@ -30,13 +30,15 @@ class Route:
         deposito_y = self.coordinates[0][1]
 
         # Coordenadas cidades entorno do depósito
+        seen = set(self.coordinates)
         while len(self.coordinates) < self.num_cities:
             factor_x = np.random.uniform(self.min_coord_factor, self.max_coord_factor)
             factor_y = np.random.uniform(self.min_coord_factor, self.max_coord_factor)
 
             coordinates = tuple((np.int32(deposito_x*factor_x)+deposito_x, np.int32((deposito_y*factor_y)))+deposito_y)
 
-            if tuple(coordinates) not in set(self.coordinates):
+            if tuple(coordinates) not in seen:
+                seen.add(coordinates)
                 self.coordinates.append(coordinates)
 
     def add_demand(self):
@@ -66,6 +68,43 @@ class Route:
 
             self.distance_matrix.append(distances)
 
+    def distances_from(self, coordinate):
+        # Distâncias (Manhattan, como em create_routes) de um ponto a todas as cidades
+        return [abs(x - coordinate[0]) + abs(y - coordinate[1]) for x, y in self.coordinates]
+
+    def add_customer(self, coordinate, demand):
+        # Atualização incremental: calcula apenas a nova linha/coluna da matriz de distâncias
+        coordinate = tuple(coordinate)
+        self.coordinates.append(coordinate)
+        self.demand.append(demand)
+        distances = self.distances_from(coordinate)
+        for row, distance in zip(self.distance_matrix, distances):
+            row.append(distance)
+        self.distance_matrix.append(distances)
+        self.num_cities += 1
+        return self.num_cities - 1
+
+    def remove_customer(self, index):
+        # Os clientes após index têm seus índices decrementados
+        if index == 0:
+            raise ValueError("O depósito não pode ser removido.")
+        del self.coordinates[index]
+        del self.demand[index]
+        del self.distance_matrix[index]
+        for row in self.distance_matrix:
+            del row[index]
+        self.num_cities -= 1
+
+    def update_customer(self, index, demand=None, coordinate=None):
+        if demand is not None:
+            self.demand[index] = demand
+        if coordinate is not None:
+            self.coordinates[index] = tuple(coordinate)
+            distances = self.distances_from(self.coordinates[index])
+            self.distance_matrix[index] = distances
+            for row, distance in zip(self.distance_matrix, distances):
+                row[index] = distance
+
     def get_demand(self):
         return self.demand
 
@@ -75,6 +114,14 @@ class Route:
     def get_coordinates(self):
         return self.coordinates
 
+    def to_dict(self):
+        # Representação serializável (JSON) da instância; tolist() converte os escalares NumPy sem truncar
+        # coordenadas ou demandas fracionárias
+        return {'capacity': np.asarray(self.capacity).tolist(),
+                'coordinates': np.asarray(self.coordinates).tolist(),
+                'demand': np.asarray(self.demand).tolist(),
+                'distance_matrix': np.asarray(self.distance_matrix).tolist()}
+
 
 class Route_Time(Route):
     def __init__(self, num_cities, capacity, min_capacity_factor=0.2, max_capacity_factor=0.6, min_deposit_coord=10,
@@ -102,9 +149,46 @@ class Route_Time(Route):
         # A diagonal deve ser zero
         np.fill_diagonal(self.time_matrix, 0)
 
+    def add_customer(self, coordinate, demand, times=None):
+        index = super().add_customer(coordinate, demand)
+        if times is None:
+            times = np.random.randint(self.min_time, self.max_time, size=index)
+        time_matrix = np.zeros((self.num_cities, self.num_cities), dtype=int)
+        time_matrix[:index, :index] = self.time_matrix
+        time_matrix[index, :index] = times
+        time_matrix[:index, index] = times
+        self.time_matrix = time_matrix
+        return index
+
+    def remove_customer(self, index):
+        super().remove_customer(index)
+        self.time_matrix = np.delete(np.delete(self.time_matrix, index, axis=0), index, axis=1)
+
     def get_time_matrix(self):
         return self.time_matrix
 
+    def to_dict(self):
+        data = super().to_dict()
+        data['time_matrix'] = np.asarray(self.time_matrix).tolist()
+        return data
+
+
+def route_from_dict(data):
+    # Reconstrói uma instância a partir de to_dict(); matrizes ausentes são recalculadas
+    coordinates = [tuple(coord) for coord in data['coordinates']]
+    if 'time_matrix' in data:
+        route = Route_Time(len(coordinates), data['capacity'])
+        route.time_matrix = np.array(data['time_matrix'], dtype=int)
+    else:
+        route = Route(len(coordinates), data['capacity'])
+    route.coordinates = coordinates
+    route.demand = list(data['demand'])
+    if 'distance_matrix' in data:
+        route.distance_matrix = [list(row) for row in data['distance_matrix']]
+    else:
+        route.add_distance_manhattan()
+    return route
+
 
 if __name__ == '__main__':
     # DISTÂNCIAS
@@ -1,18 +1,26 @@
+import os
+import warnings
+
 import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.animation import FuncAnimation, PillowWriter
-
-from aco import MO_ACO_VRPT
+from matplotlib.collections import LineCollection
 
 
 class Visualizacao:
-    def __init__(self, routes, solution=None, aco_vrp=None):
+    def __init__(self, routes, solution=None, aco_vrp=None, label_distances=None, label_threshold=20,
+                 max_detailed_nodes=150, max_edges=5000):
         self.routes = routes
+        # label_distances: True/False força os rótulos das arestas; None rotula apenas até label_threshold cidades
+        self.label_distances = label_distances
+        self.label_threshold = label_threshold
+        # Acima de max_detailed_nodes cidades: sem rótulos, sem setas e arestas amostradas até max_edges
+        self.max_detailed_nodes = max_detailed_nodes
+        self.max_edges = max_edges
         self.coordinates = routes.coordinates
         self.demand = routes.demand
         self.distance_matrix = routes.distance_matrix
         if aco_vrp is not None:
-            if isinstance(aco_vrp, MO_ACO_VRPT):
+            if hasattr(aco_vrp, 'best_pareto_front'):  # MO_ACO_VRPT
                 self.pareto_front = aco_vrp.best_pareto_front
             self.best_solution = aco_vrp.best_solution
             self.solutions = aco_vrp.history["solution"]
@@ -20,61 +28,111 @@ class Visualizacao:
         else:
             self.best_solution = solution
 
-    def exibir_iteracoes_animado(self, file_name):
+    def exibir_iteracoes_animado(self, file_name, folder='Animacoes', fmt='gif', fps=1, step=1, max_frames=None,
+                                 dpi=100):
+        """Exporta a evolução das soluções quadro a quadro direto para o writer (sem FuncAnimation).
+
+        A camada das cidades é desenhada uma única vez; por quadro só os dados das rotas são atualizados. Apenas
+        com o ffmpeg os quadros são enviados em fluxo (memória constante); sem ele, GIFs são gerados pelo Pillow,
+        que mantém todos os quadros em memória até o fim (use step/max_frames para limitá-los).
+        """
+        from matplotlib.animation import FFMpegWriter, PillowWriter, writers
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
         colors = ["blue", "green", "red", "cyan", "magenta", "yellow", "black"]
-        fig, ax = plt.subplots(figsize=(10, 8))
+        frames = self.select_frames(step, max_frames)
+
+        if writers.is_available('ffmpeg'):
+            writer = FFMpegWriter(fps=fps)  # Envia cada quadro por pipe ao ffmpeg (GIF ou MP4)
+        elif fmt == 'gif':
+            warnings.warn("ffmpeg não encontrado: usando o PillowWriter, que mantém todos os quadros em memória.",
+                          RuntimeWarning)
+            writer = PillowWriter(fps=fps)
+        else:
+            raise RuntimeError(f"ffmpeg não encontrado: não é possível exportar '{fmt}'.")
+
+        # Figura desacoplada do pyplot, renderizada pelo Agg (funciona sem display)
+        fig = Figure(figsize=(10, 8))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
         ax.set_xlabel('Coordenada X')
         ax.set_ylabel('Coordenada Y')
         ax.grid(True)
 
-        def init():
-            self.identify_cities(ax)
-            return []
-
-        def update(frame):
-            ax.clear()
-            self.identify_cities(ax)
-            ax.set_xlabel('Coordenada X')
-            ax.set_ylabel('Coordenada Y')
-            ax.grid(True)
-            solution = self.solutions[frame]
-            for vehicle_index, route in enumerate(solution):
-                self.plot_vectors(ax, colors, route, vehicle_index)
-            ax.set_title(f'Solução {frame + 1}')
-            return []
-
-        ani = FuncAnimation(fig, update, frames=len(self.solutions), init_func=init, blit=True, repeat=False)
-        ani.save(f'Animacoes/{file_name}.gif', writer=PillowWriter(fps=1))
+        coordinates = np.array(self.coordinates, dtype=float)
+        ax.scatter(coordinates[1:, 0], coordinates[1:, 1], c='blue', marker='o', zorder=3)
+        ax.scatter(coordinates[0, 0], coordinates[0, 1], s=100, c='green', marker='o', zorder=3)
+        self.identify_cities(ax)
+        margin = 0.05 * max(np.ptp(coordinates[:, 0]), np.ptp(coordinates[:, 1]), 1)
+        ax.set_xlim(coordinates[:, 0].min() - margin, coordinates[:, 0].max() + margin)
+        ax.set_ylim(coordinates[:, 1].min() - margin, coordinates[:, 1].max() + margin * 3)
+
+        lines = []
+        title = ax.set_title('')
+        os.makedirs(folder, exist_ok=True)
+        with writer.saving(fig, os.path.join(folder, f'{file_name}.{fmt}'), dpi):
+            for frame in frames:
+                solution = self.solutions[frame]
+                if isinstance(solution, tuple):  # MO_ACO_VRP guarda (num_vehicles, solution)
+                    solution = solution[1]
+
+                while len(lines) < len(solution):
+                    vehicle_index = len(lines)
+                    line, = ax.plot([], [], color=colors[vehicle_index % len(colors)], marker='o',
+                                    label=f'Veículo {vehicle_index + 1}')
+                    lines.append(line)
+                    ax.legend(loc='upper right')
+
+                for vehicle_index, line in enumerate(lines):
+                    if vehicle_index < len(solution):
+                        route_coordinates = coordinates[solution[vehicle_index]]
+                        line.set_data(route_coordinates[:, 0], route_coordinates[:, 1])
+                    else:
+                        line.set_data([], [])
+                title.set_text(f'Solução {frame + 1}')
+                writer.grab_frame()
+
+    def select_frames(self, step=1, max_frames=None):
+        # Subamostragem dos quadros; a última solução (a melhor) é sempre incluída
+        frames = list(range(0, len(self.solutions), step))
+        if max_frames is not None and len(frames) > max_frames:
+            frames = [frames[i] for i in np.linspace(0, len(frames) - 1, max_frames).astype(int)]
+        if frames and frames[-1] != len(self.solutions) - 1:
+            frames.append(len(self.solutions) - 1)
+        return frames
+
+    def is_detailed(self):
+        return len(self.coordinates) <= self.max_detailed_nodes
 
     def identify_cities(self, ax):
+        if not self.is_detailed():
+            return
         for i, coord in enumerate(self.coordinates):
             ax.annotate(str(i), (coord[0], coord[1]),
                         fontsize=16, textcoords="offset points", xytext=(0, 10), ha='center')
 
     def plot_vectors(self, ax, colors, route, vehicle_index):
-        route_coordinates = [self.coordinates[location] for location in route]
-        route_coordinates = np.array(route_coordinates)
-        for i in range(len(route_coordinates) - 1):
-            atual_coord_x = float(route_coordinates[i][0])
-            atual_coord_y = float(route_coordinates[i][1])
-            proximo_coord_x = float(route_coordinates[i + 1][0])
-            proximo_coord_y = float(route_coordinates[i + 1][1])
-            ax.arrow(atual_coord_x, atual_coord_y, proximo_coord_x - atual_coord_x,
-                     proximo_coord_y - atual_coord_y,
-                     color=colors[vehicle_index % len(colors)], length_includes_head=True, head_width=5, width=1)
-        ax.plot(route_coordinates[:, 0], route_coordinates[:, 1],
-                color=colors[vehicle_index % len(colors)], marker='o', label=f'Veículo {vehicle_index + 1}')
-        ax.legend()
+        # Um único artista por veículo: setas (quiver) ou, em instâncias grandes, uma LineCollection
+        color = colors[vehicle_index % len(colors)]
+        route_coordinates = np.array([self.coordinates[location] for location in route], dtype=float)
+        origins = route_coordinates[:-1]
+        deltas = route_coordinates[1:] - origins
+        if self.is_detailed():
+            ax.quiver(origins[:, 0], origins[:, 1], deltas[:, 0], deltas[:, 1], color=color, angles='xy',
+                      scale_units='xy', scale=1, width=0.003, label=f'Veículo {vehicle_index + 1}')
+            ax.scatter(route_coordinates[:, 0], route_coordinates[:, 1], color=color, marker='o')
+        else:
+            segments = np.stack([origins, route_coordinates[1:]], axis=1)
+            ax.add_collection(LineCollection(segments, colors=color, linewidths=1,
+                                             label=f'Veículo {vehicle_index + 1}'))
+            ax.autoscale_view()
 
     def plot_cost(self):
         plt.figure(figsize=(10, 8))
-        iterations = []
-        best_costs = []
-
-        for _, iteration, best_cost in self.hist_costs:
-            iterations.append(iteration)
-            best_costs.append(best_cost)
-        plt.plot(iterations, best_costs)
+        # Colunas: (num_vehicles, iteration, best_cost); funciona com History em qualquer modo
+        costs = np.asarray(self.hist_costs, dtype=float).reshape(-1, 3)
+        plt.plot(costs[:, 1], costs[:, 2])
 
         plt.xlabel('Iteração')
         plt.ylabel('Custo')
@@ -83,14 +141,8 @@ class Visualizacao:
         plt.show()
 
     def plot_cities(self):
-        self.mark_cities()
-
-        # Plotando as distâncias
-        for i in range(len(self.coordinates)):
-            for j in range(i + 1, len(self.coordinates)):
-                if self.distance_matrix[i][j] != 0:
-                    mid_x, mid_y = self.calc_distance(i, j)
-                    plt.text(mid_x, mid_y, f'{self.distance_matrix[i][j]:.1f}', fontsize=16, ha='center', va='center')
+        ax = self.mark_cities()
+        self.plot_distances(ax)
 
         plt.xlabel('Coordenada X')
         plt.ylabel('Coordenada Y')
@@ -98,25 +150,9 @@ class Visualizacao:
         plt.grid()
         plt.show()
 
-    def calc_distance(self, i, j):
-        x_values = [self.coordinates[i][0], self.coordinates[j][0]]
-        y_values = [self.coordinates[i][1], self.coordinates[j][1]]
-        plt.plot(x_values, y_values, 'k--', alpha=0.5)
-        mid_x = (self.coordinates[i][0] + self.coordinates[j][0]) / 2
-        mid_y = (self.coordinates[i][1] + self.coordinates[j][1]) / 2
-        return mid_x, mid_y
-
     def plot_cities_time(self):
-        self.mark_cities()
-
-        # Plotando as distâncias
-        for i in range(len(self.coordinates)):
-            for j in range(i + 1, len(self.coordinates)):
-                if self.distance_matrix[i][j] != 0:
-                    mid_x, mid_y = self.calc_distance(i, j)
-                    time = self.routes.time_matrix[i][j]
-                    plt.text(mid_x, mid_y, f'{self.distance_matrix[i][j]:.1f}; {time}', fontsize=16,
-                             ha='center', va='center')
+        ax = self.mark_cities()
+        self.plot_distances(ax, time_matrix=self.routes.time_matrix)
 
         plt.xlabel('Coordenada X')
         plt.ylabel('Coordenada Y')
@@ -124,23 +160,63 @@ class Visualizacao:
         plt.grid()
         plt.show()
 
+    def plot_distances(self, ax, time_matrix=None):
+        # Todas as arestas em uma única LineCollection, em vez de um plt.plot por par de cidades
+        coordinates = np.array(self.coordinates, dtype=float)
+        num_cities = len(coordinates)
+        if self.is_detailed() or num_cities * (num_cities - 1) // 2 <= self.max_edges:
+            rows, cols = np.triu_indices(num_cities, k=1)
+            distances = np.asarray(self.distance_matrix)[rows, cols]
+        else:
+            # Amostra max_edges pares i < j diretamente, sem materializar a matriz nem os n(n-1)/2 pares. Gerador
+            # local: plotar não altera o estado do np.random global (semeado pelos solvers)
+            rng = np.random.default_rng()
+            rows = rng.integers(num_cities, size=self.max_edges)
+            cols = rng.integers(num_cities - 1, size=self.max_edges)
+            cols += cols >= rows
+            pairs = np.unique(np.minimum(rows, cols) * num_cities + np.maximum(rows, cols))
+            rows, cols = pairs // num_cities, pairs % num_cities
+            distances = np.array([self.distance_matrix[i][j] for i, j in zip(rows, cols)])
+        non_zero = distances != 0
+        rows, cols, distances = rows[non_zero], cols[non_zero], distances[non_zero]
+
+        segments = np.stack([coordinates[rows], coordinates[cols]], axis=1)
+        ax.add_collection(LineCollection(segments, colors='k', linestyles='--', alpha=0.5, linewidths=1))
+        ax.autoscale_view()
+
+        label_distances = self.label_distances
+        if label_distances is None:
+            label_distances = len(coordinates) <= self.label_threshold
+        if not label_distances or not self.is_detailed():
+            return
+
+        midpoints = segments.mean(axis=1)
+        for (mid_x, mid_y), distance, i, j in zip(midpoints, distances, rows, cols):
+            label = f'{distance:.1f}'
+            if time_matrix is not None:
+                label += f'; {time_matrix[i][j]}'
+            ax.text(mid_x, mid_y, label, fontsize=16, ha='center', va='center')
+
     def mark_cities(self):
         plt.figure(figsize=(10, 8))
-        # Plotando as cidades
-        for i, coord in enumerate(self.coordinates):
-            if i == 0:  # Destacar o ponto inicial
-                plt.scatter(coord[0], coord[1], s=100, c='green', marker='o')
-            else:
-                plt.scatter(coord[0], coord[1], c='blue', marker='o')
-            plt.text(coord[0], coord[1], f' {i} (D: {self.demand[i]})', fontsize=16, ha='right')
+        ax = plt.gca()
+        # Plotando as cidades (um scatter para os clientes e outro para o depósito)
+        coordinates = np.array(self.coordinates, dtype=float)
+        ax.scatter(coordinates[1:, 0], coordinates[1:, 1], c='blue', marker='o', s=None if self.is_detailed() else 4)
+        ax.scatter(coordinates[0, 0], coordinates[0, 1], s=100, c='green', marker='o')  # Destacar o ponto inicial
+        if self.is_detailed():
+            for i, coord in enumerate(self.coordinates):
+                ax.text(coord[0], coord[1], f' {i} (D: {self.demand[i]})', fontsize=16, ha='right')
+        return ax
 
     def plot_solution(self):
         colors = ["blue", "green", "red", "cyan", "magenta", "yellow", "black"]
 
         plt.figure(figsize=(10, 8))
+        ax = plt.gca()
         for vehicle_index, route in enumerate(self.best_solution):
-            self.plot_vectors(plt, colors, route, vehicle_index)
-        self.identify_cities(plt)
+            self.plot_vectors(ax, colors, route, vehicle_index)
+        self.identify_cities(ax)
 
         plt.xlabel('Coordenada X')
         plt.ylabel('Coordenada Y')
@@ -153,9 +229,10 @@ class Visualizacao:
         colors = ["blue", "green", "red", "cyan", "magenta", "yellow", "black"]
 
         plt.figure(figsize=(10, 8))
+        ax = plt.gca()
         for vehicle_index, route in enumerate(self.best_solution[index]):
-            self.plot_vectors(plt, colors, route, vehicle_index)
-        self.identify_cities(plt)
+            self.plot_vectors(ax, colors, route, vehicle_index)
+        self.identify_cities(ax)
 
         plt.xlabel('Coordenada X')
         plt.ylabel('Coordenada Y')